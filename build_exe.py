@@ -4,108 +4,540 @@
 构建exe文件的脚本
 """
 
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import importlib.metadata
+import importlib.util
+import json
+import modulefinder
 import os
+import pkgutil
+import shutil
 import subprocess
 import sys
+import zipapp
 from pathlib import Path
 
 
-def build_exe():
-    """使用PyInstaller构建exe文件"""
-    print("开始构建exe文件...")
+APP_NAME = "音频分割工具"
+ENTRY_SCRIPT = "main.py"
+WORK_PATH = ".pyi-work"  # 持久化的PyInstaller工作目录，跨次构建保留，每个构建目标一个子目录
+DATA_FILES = ["README.md", "使用说明_v3.2_视频时长匹配版.txt"]  # 随程序发布的数据文件
+EXE_SUFFIX = ".exe" if sys.platform == "win32" else ""  # 容器内构建的是Linux版本
+# 不需要打包的模块，由scipy、cv2等依赖间接引入，排除后可减小程序体积
+# 注意: matplotlib和tkinter是界面所需，scipy.optimize被librosa使用，都不能排除
+# PyQt5/PySide2: 确保Qt不会经由其他依赖重新被打包
+EXCLUDED_MODULES = ["pytest", "IPython", "jedi", "pandas", "notebook", "PIL.ImageQt", "PyQt5", "PySide2"]
+CONTAINER_IMAGE = "pyi-builder:py311"  # 预装打包依赖的构建镜像，见Dockerfile
+CACHE_VOLUME = "pyi-cache"  # 持久化PyInstaller缓存的docker数据卷
+PYZ_INTERPRETER = "/usr/bin/env python3"  # pyz文件使用系统Python运行
+VERSION_CACHE_FILE = Path.home() / ".cache" / "audio-splitter-build.json"  # PyInstaller版本缓存
+
+# 构建目标列表，多个目标时并行构建
+# name: 程序名, entry: 入口脚本, windowed: 是否隐藏控制台,
+# hidden_imports: 额外的hidden-import, collect_packages: 整体收集子模块、二进制文件和数据文件的包
+# cv2的扩展模块和ffmpeg动态库、soundfile的libsndfile(_soundfile_data)都需要整体收集
+TARGETS = [
+    {"name": APP_NAME, "entry": ENTRY_SCRIPT, "windowed": True, "collect_packages": ["cv2", "_soundfile_data"]},
+]
+
+
+def is_distribution_installed(name):
+    """检查指定的pip包是否已安装"""
+    try:
+        importlib.metadata.distribution(name)
+        return True
+    except importlib.metadata.PackageNotFoundError:
+        return False
+
+
+def check_opencv_headless():
+    """
+    检查打包环境中安装的是无界面版OpenCV
     
-    # PyInstaller命令参数
-    cmd = [
-        "pyinstaller",
-        "--onefile",  # 打包成单个exe文件
-        "--windowed",  # 不显示控制台窗口
-        "--name=音频分割工具",  # 设置exe文件名
+    opencv-python附带Qt界面库，解压后比opencv-python-headless大约35MB（其中Qt5动态库约28MB，
+    按opencv-python 5.0.0.93 Linux x86_64 wheel实测）；本程序只用OpenCV读取视频信息，打包时应使用opencv-python-headless
+    
+    Returns:
+        bool: 检查是否通过
+    """
+    if is_distribution_installed("opencv-python") or not is_distribution_installed("opencv-python-headless"):
+        print("错误: 打包环境需要使用无界面版OpenCV (opencv-python-headless)")
+        print("请运行: pip uninstall opencv-python && pip install opencv-python-headless")
+        return False
+    
+    return True
+
+
+def get_pyinstaller_version():
+    """
+    获取PyInstaller版本，结果缓存在 ~/.cache/audio-splitter-build.json 中
+    
+    导入PyInstaller本身需要几十毫秒，缓存以PyInstaller包文件的路径和修改时间为键，
+    重新安装或升级后自动失效
+    
+    Returns:
+        str: PyInstaller版本号，未安装时为None
+    """
+    spec = importlib.util.find_spec("PyInstaller")
+    if spec is None:
+        return None
+    
+    cache_key = {"origin": spec.origin, "mtime": os.path.getmtime(spec.origin)}
+    
+    try:
+        cache = json.loads(VERSION_CACHE_FILE.read_text(encoding="utf-8"))
+        if cache.get("pyinstaller") == cache_key:
+            return cache["pyinstaller_version"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    
+    # 缓存未命中，导入PyInstaller获取版本并更新缓存
+    import PyInstaller
+    
+    try:
+        VERSION_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        VERSION_CACHE_FILE.write_text(json.dumps({"pyinstaller": cache_key,
+                                                  "pyinstaller_version": PyInstaller.__version__}),
+                                      encoding="utf-8")
+    except OSError:
+        pass
+    
+    return PyInstaller.__version__
+
+
+def find_imports(script=ENTRY_SCRIPT):
+    """
+    解析主程序的导入关系
+    
+    只在项目目录内解析模块，第三方库按导入名记录在badmodules中，避免遍历整个依赖树
+    
+    Args:
+        script (str): 主程序文件
+        
+    Returns:
+        ModuleFinder: 解析完成的ModuleFinder对象
+    """
+    finder = modulefinder.ModuleFinder(path=[os.path.dirname(os.path.abspath(script))])
+    finder.run_script(script)
+    return finder
+
+
+def find_project_modules(script=ENTRY_SCRIPT):
+    """获取主程序导入的项目内模块名（不含主程序本身）"""
+    finder = find_imports(script)
+    return sorted(name for name, module in finder.modules.items()
+                  if name != "__main__" and module.__file__)
+
+
+def collect_hidden_imports(root_pkg):
+    """
+    收集模块及其全部子模块，用作PyInstaller的hidden-import
+    
+    Args:
+        root_pkg (str): 模块或包名
+        
+    Returns:
+        list: 模块名列表，找不到模块时为空列表
+    """
+    spec = importlib.util.find_spec(root_pkg)
+    if spec is None:
+        return []
+    
+    modules = [root_pkg]
+    
+    # 普通模块没有子模块，包则递归收集所有子模块
+    if spec.submodule_search_locations:
+        for module_info in pkgutil.walk_packages(spec.submodule_search_locations, prefix=root_pkg + "."):
+            modules.append(module_info.name)
+    
+    return modules
+
+
+def get_work_path(target):
+    """获取构建目标的工作目录，各目标互不共享，并行构建时不会争用"""
+    return Path(WORK_PATH) / target["name"]
+
+
+def get_spec_file(target):
+    """获取构建目标的spec文件路径"""
+    return Path(f"{target['name']}.spec")
+
+
+def get_spec_options(target):
+    """获取生成spec文件所用的PyInstaller参数"""
+    options = [
+        "--onedir",  # 打包成目录，避免单文件模式每次启动都解压到临时目录
+        "--contents-directory=_internal",  # 依赖文件统一放在_internal子目录
+        f"--name={target['name']}",  # 设置exe文件名
         "--icon=icon.ico",  # 图标文件（如果存在）
-        "--add-data=README.md;.",  # 添加README文件
-        "--add-data=使用说明_v3.2_视频时长匹配版.txt;.",  # 添加使用说明
-        "--hidden-import=cv2",  # 确保包含OpenCV
-        "--hidden-import=video_processor",  # 确保包含视频处理模块
-        "main.py"  # 主程序文件
+        "--collect-submodules=scipy",  # scipy存在动态导入的子模块
+        "--collect-binaries=scipy",  # scipy动态加载的DLL
     ]
     
+    if target.get("windowed"):
+        options.append("--windowed")  # 不显示控制台窗口
+    
+    # 排除不需要的模块
+    options += [f"--exclude-module={name}" for name in EXCLUDED_MODULES]
+    
+    # 添加README和使用说明
+    options += [f"--add-data={data_file}{os.pathsep}." for data_file in DATA_FILES]
+    
+    # 目标指定的额外模块
+    options += [f"--hidden-import={name}" for name in target.get("hidden_imports", [])]
+    
+    # 整体收集的包（如OpenCV），直接收集文件，不再逐个模块搜索
+    for name in target.get("collect_packages", []):
+        options += [f"--collect-binaries={name}", f"--collect-data={name}", f"--collect-submodules={name}"]
+    
+    # 自动收集入口脚本导入的项目模块，避免手工维护hidden-import列表
+    for module_name in find_project_modules(target["entry"]):
+        options += [f"--hidden-import={name}" for name in collect_hidden_imports(module_name)]
+    
     # 如果没有图标文件，移除图标参数
     if not os.path.exists("icon.ico"):
-        cmd = [arg for arg in cmd if not arg.startswith("--icon")]
+        options = [arg for arg in options if not arg.startswith("--icon")]
+    
+    return options
+
+
+def compute_import_graph_hash(target):
+    """
+    计算入口脚本导入图的哈希值
+    
+    Args:
+        target (dict): 构建目标
+        
+    Returns:
+        str: 导入图和打包参数的哈希值
+    """
+    finder = find_imports(target["entry"])
+    module_names = sorted(set(finder.modules) | set(finder.badmodules))
+    
+    digest = hashlib.sha256()
+    digest.update("\n".join(module_names).encode("utf-8"))
+    digest.update("\n".join(get_spec_options(target)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def compute_build_hash(target):
+    """
+    计算构建输入的哈希值
+    
+    包括项目源码、数据文件、图标、打包参数和PyInstaller版本，任一变化都需要重新构建
+    
+    Args:
+        target (dict): 构建目标
+        
+    Returns:
+        str: 构建输入的哈希值
+    """
+    input_files = sorted(Path(".").glob("*.py")) + [Path(data_file) for data_file in DATA_FILES]
+    if os.path.exists("icon.ico"):
+        input_files.append(Path("icon.ico"))
+    
+    digest = hashlib.blake2b(digest_size=16)
+    for input_file in input_files:
+        digest.update(str(input_file).encode("utf-8"))
+        digest.update(input_file.read_bytes())
+    digest.update("\n".join(get_spec_options(target)).encode("utf-8"))
+    digest.update(get_pyinstaller_version().encode("utf-8"))
+    return digest.hexdigest()
+
+
+def generate_spec(target):
+    """生成spec文件，导入图未变化时复用已有的spec文件"""
+    spec_file = get_spec_file(target)
+    spec_hash_file = get_work_path(target) / "spec.hash"
+    graph_hash = compute_import_graph_hash(target)
+    
+    if spec_file.exists() and spec_hash_file.exists() and spec_hash_file.read_text() == graph_hash:
+        print(f"导入图未变化，复用spec文件: {spec_file}")
+        return
+    
+    cmd = ["pyi-makespec"] + get_spec_options(target) + [target["entry"]]
+    print(f"生成spec文件: {' '.join(cmd)}")
+    subprocess.run(cmd, check=True, capture_output=True, text=True)
+    
+    spec_hash_file.parent.mkdir(parents=True, exist_ok=True)
+    spec_hash_file.write_text(graph_hash)
+
+
+def run_streaming(cmd, prefix=""):
+    """
+    执行命令并逐行输出日志，不在内存中缓存全部输出
+    
+    Args:
+        cmd (list): 命令参数列表
+        prefix (str): 每行输出的前缀，并行构建时用于区分目标
+        
+    Raises:
+        subprocess.CalledProcessError: 命令返回非零退出码
+    """
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, bufsize=1)
+    for line in process.stdout:
+        sys.stdout.write(prefix + line)
+    
+    returncode = process.wait()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, cmd)
+
+
+def build_from_spec(target):
+    """根据spec文件构建，复用持久化工作目录中的分析结果"""
+    cmd = [
+        "pyinstaller",
+        "--noconfirm",  # 覆盖已有的dist目录
+        f"--workpath={get_work_path(target)}",  # 持久化工作目录，未变化的模块不再重新分析
+        "--distpath=dist",
+        str(get_spec_file(target))
+    ]
+    
+    print(f"执行命令: {' '.join(cmd)}")
+    run_streaming(cmd, prefix=f"[{target['name']}] ")
+
+
+def build_exe(target=None):
+    """
+    使用PyInstaller构建exe文件
+    
+    Args:
+        target (dict, optional): 构建目标，默认为主程序（TARGETS[0]）
+        
+    Returns:
+        bool: 构建是否成功
+    """
+    if target is None:
+        target = TARGETS[0]
+    name = target["name"]
+    print(f"开始构建exe文件: {name}")
+    print("打包模式: 目录模式(onedir)，启动时无需解压到临时目录，发布时另附zip压缩包")
+    
+    app_dir = Path("dist") / name
+    exe_path = app_dir / f"{name}{EXE_SUFFIX}"
+    build_hash_file = get_work_path(target) / "build.hash"  # 上次成功构建的输入哈希
+    
+    if not check_opencv_headless():
+        return False
     
     try:
-        # 执行PyInstaller命令
-        print(f"执行命令: {' '.join(cmd)}")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        # 构建输入未变化且exe已存在时跳过构建
+        build_hash = compute_build_hash(target)
+        if exe_path.exists() and build_hash_file.exists() and build_hash_file.read_text() == build_hash:
+            print(f"构建输入未变化，exe已是最新: {exe_path}")
+            return True
+        
+        # 生成（或复用）spec文件，然后执行构建
+        generate_spec(target)
+        build_from_spec(target)
         
         print("构建成功！")
-        print(result.stdout)
         
         # 检查生成的exe文件
-        exe_path = Path("dist") / "音频分割工具.exe"
         if exe_path.exists():
             file_size = exe_path.stat().st_size / (1024 * 1024)  # MB
             print(f"\n生成的exe文件:")
             print(f"路径: {exe_path}")
             print(f"大小: {file_size:.1f} MB")
             
+            # 打包为zip，方便作为单个文件分发
+            archive_path = shutil.make_archive(str(app_dir), "zip", str(app_dir))
+            archive_size = Path(archive_path).stat().st_size / (1024 * 1024)  # MB
+            print(f"发布压缩包: {archive_path} ({archive_size:.1f} MB)")
+            
+            # 记录本次构建的输入哈希
+            build_hash_file.write_text(build_hash)
+            
             return True
         else:
             print("错误: 未找到生成的exe文件")
             return False
             
     except subprocess.CalledProcessError as e:
+        # PyInstaller的输出已实时打印，这里只报告失败的命令
         print(f"构建失败: {e}")
-        print(f"错误输出: {e.stderr}")
         return False
     except Exception as e:
         print(f"构建过程中发生错误: {e}")
         return False
 
 
+def build_pyz(target=None):
+    """
+    使用标准库zipapp构建pyz文件
+    
+    pyz只包含项目源码，由系统Python直接运行，没有PyInstaller引导程序的启动开销；
+    运行环境需要已安装requirements.txt中的依赖
+    
+    Args:
+        target (dict, optional): 构建目标，默认为主程序（TARGETS[0]）
+        
+    Returns:
+        bool: 构建是否成功
+    """
+    if target is None:
+        target = TARGETS[0]
+    name = target["name"]
+    print(f"开始构建pyz文件: {name}")
+    
+    staging_dir = get_work_path(target) / "pyz"
+    pyz_path = Path("dist") / f"{name}.pyz"
+    
+    try:
+        # 只复制入口脚本及其导入的项目模块
+        if staging_dir.exists():
+            shutil.rmtree(staging_dir)
+        staging_dir.mkdir(parents=True)
+        
+        entry_module = Path(target["entry"]).stem
+        shutil.copy2(target["entry"], staging_dir)
+        for module_name in find_project_modules(target["entry"]):
+            shutil.copy2(f"{module_name}.py", staging_dir)
+        
+        pyz_path.parent.mkdir(exist_ok=True)
+        zipapp.create_archive(staging_dir, target=pyz_path, interpreter=PYZ_INTERPRETER,
+                              main=f"{entry_module}:main", compressed=True)
+        
+        print("构建成功！")
+        print(f"路径: {pyz_path}")
+        print(f"大小: {pyz_path.stat().st_size / 1024:.1f} KB")
+        return True
+        
+    except Exception as e:
+        print(f"构建过程中发生错误: {e}")
+        return False
+
+
+def build_all(targets=TARGETS):
+    """
+    构建所有目标，多个目标时每个目标一个进程并行构建
+    
+    Args:
+        targets (list): 构建目标列表
+        
+    Returns:
+        bool: 是否全部构建成功
+    """
+    if len(targets) == 1:
+        return build_exe(targets[0])
+    
+    max_workers = min(len(targets), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(build_exe, targets))
+    
+    for target, success in zip(targets, results):
+        print(f"{target['name']}: {'成功' if success else '失败'}")
+    
+    return all(results)
+
+
+def build_in_container():
+    """
+    在可复用的容器镜像中构建
+    
+    镜像中预装了打包依赖，PyInstaller缓存保存在docker数据卷中，
+    每次构建无需重新安装依赖。注意容器内生成的是Linux版本
+    
+    Returns:
+        bool: 构建是否成功
+    """
+    if shutil.which("docker") is None:
+        print("错误: 未找到docker命令")
+        return False
+    
+    try:
+        # 镜像不存在时先构建镜像
+        inspect = subprocess.run(["docker", "image", "inspect", CONTAINER_IMAGE], capture_output=True)
+        if inspect.returncode != 0:
+            print(f"构建镜像: {CONTAINER_IMAGE}")
+            subprocess.run(["docker", "build", "-t", CONTAINER_IMAGE, "."], check=True)
+        
+        cmd = [
+            "docker", "run", "--rm",
+            "-v", f"{os.getcwd()}:/src",
+            "-v", f"{CACHE_VOLUME}:/root/.cache/pyinstaller",
+            CONTAINER_IMAGE,
+            "python", "build_exe.py"
+        ]
+        print(f"执行命令: {' '.join(cmd)}")
+        subprocess.run(cmd, check=True)
+        return True
+        
+    except subprocess.CalledProcessError as e:
+        print(f"容器构建失败: {e}")
+        return False
+
+
 def clean_build_files():
-    """清理构建过程中生成的临时文件"""
-    print("\n清理构建文件...")
+    """
+    清理构建过程中生成的临时文件
     
-    import shutil
+    spec文件和工作目录作为构建缓存保留，下次构建可直接复用；
+    如需完全重新构建，手动删除 .pyi-work 目录即可
+    """
+    print("\n清理构建文件...")
     
-    # 删除build目录
+    # 删除旧版本遗留的build目录
     if os.path.exists("build"):
         shutil.rmtree("build")
         print("已删除build目录")
     
-    # 删除spec文件
-    spec_file = "音频分割工具.spec"
-    if os.path.exists(spec_file):
-        os.remove(spec_file)
-        print(f"已删除{spec_file}")
+    spec_files = ", ".join(str(get_spec_file(target)) for target in TARGETS)
+    print(f"保留构建缓存: {spec_files}, {WORK_PATH}/")
 
 
 def main():
     """主函数"""
+    parser = argparse.ArgumentParser(description="音频分割工具打包程序")
+    parser.add_argument("--container", action="store_true",
+                        help=f"在docker镜像 {CONTAINER_IMAGE} 中构建（生成Linux版本）")
+    parser.add_argument("--format", choices=["exe", "pyz"], default="exe",
+                        help="exe: PyInstaller程序目录; pyz: zipapp文件，由已安装依赖的系统Python运行")
+    args = parser.parse_args()
+    
     print("=== 音频分割工具打包程序 ===\n")
     
+    if args.format == "pyz":
+        if all(build_pyz(target) for target in TARGETS):
+            print("\n🎉 打包完成！")
+            for target in TARGETS:
+                print(f"运行方式: python dist/{target['name']}.pyz")
+        else:
+            print("\n❌ 打包失败")
+        return
+    
+    if args.container:
+        if build_in_container():
+            print(f"\n🎉 容器构建完成！程序位于 dist/{APP_NAME} 目录中")
+        else:
+            print("\n❌ 容器构建失败")
+        return
+    
     # 检查依赖
-    try:
-        import PyInstaller
-        print(f"PyInstaller版本: {PyInstaller.__version__}")
-    except ImportError:
+    pyinstaller_version = get_pyinstaller_version()
+    if pyinstaller_version is None:
         print("错误: 未安装PyInstaller")
         print("请运行: pip install pyinstaller")
         return
+    print(f"PyInstaller版本: {pyinstaller_version}")
     
     # 构建exe文件
-    success = build_exe()
+    success = build_all()
     
     if success:
         print("\n🎉 打包完成！")
-        print("exe文件位于 dist 目录中")
+        for target in TARGETS:
+            print(f"exe文件位于 dist/{target['name']} 目录中，发布压缩包为 dist/{target['name']}.zip")
         
         # 询问是否清理临时文件
         try:
             choice = input("\n是否清理构建临时文件？(y/n): ").lower().strip()
             if choice in ['y', 'yes', '是']:
                 clean_build_files()
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
+            # 容器等非交互环境中没有标准输入
             print("\n操作取消")
     else:
         print("\n❌ 打包失败")
@@ -4,27 +4,172 @@
 创建测试音频文件
 """
 
+import hashlib
+import inspect
+import math
+import tempfile
+import threading
+import wave
+from functools import lru_cache
 import numpy as np
-import soundfile as sf
 import os
 
 
+CHUNK_SAMPLES = 65536  # 每次写入的采样点数上限，限制内存占用
+SHARED_TONE_DIR = os.path.join(tempfile.gettempdir(), "audio_splitter_test_tones")  # 各测试共用的测试音频目录
+
+
+def write_tone(output_file, frequency, duration=5, sample_rate=44100, amplitude=0.3):
+    """
+    生成整数频率的正弦波并写入16位WAV文件
+    
+    Args:
+        output_file (str): 输出文件路径
+        frequency (int): 频率（Hz）
+        duration (float): 时长（秒）
+        sample_rate (int): 采样率
+        amplitude (float): 振幅（0-1）
+    
+    Returns:
+        str: 输出文件路径
+    """
+    # 整数频率的正弦波每 sample_rate / gcd(sample_rate, frequency) 个采样点精确重复一次，
+    # 只计算一个周期的波形，再重复写入到整个时长
+    num_samples = int(sample_rate * duration)
+    period = sample_rate // math.gcd(sample_rate, frequency)
+    
+    # 生成一个周期的相位（整数取模后转float32，保证精度）
+    phase_index = np.arange(period)
+    phase_index *= frequency
+    phase_index %= sample_rate
+    wave_data = phase_index.astype(np.float32)
+    
+    # 在同一个缓冲区上原地计算正弦波和缩放，不产生临时数组
+    np.multiply(wave_data, np.float32(2 * np.pi / sample_rate), out=wave_data)
+    np.sin(wave_data, out=wave_data)
+    np.multiply(wave_data, np.float32(amplitude * 32767), out=wave_data)
+    np.rint(wave_data, out=wave_data)
+    
+    # 转换为16位整数
+    one_period = wave_data.astype('<i2')
+    
+    # 写入块由整数个周期组成，每个块的内容完全相同，只需生成一次后重复写入
+    periods_per_chunk = max(1, CHUNK_SAMPLES // period)
+    chunk = np.tile(one_period, periods_per_chunk)
+    chunk_bytes = memoryview(chunk).cast('B')
+    full_chunks, remainder = divmod(num_samples, len(chunk))
+    
+    # 分块保存为16位WAV文件，内存占用与音频时长无关
+    with wave.open(output_file, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        for _ in range(full_chunks):
+            wav_file.writeframesraw(chunk_bytes)
+        wav_file.writeframesraw(chunk_bytes[:remainder * chunk.itemsize])
+    
+    return output_file
+
+
+def is_matching_wav(file_path, sample_rate, num_samples):
+    """检查已有的WAV文件是否为指定参数的16位单声道音频（只读取文件头）"""
+    try:
+        with wave.open(file_path, "rb") as wav_file:
+            return (wav_file.getnchannels() == 1 and wav_file.getsampwidth() == 2 and
+                    wav_file.getframerate() == sample_rate and wav_file.getnframes() == num_samples)
+    except (OSError, EOFError, wave.Error):
+        return False
+
+
+def spec_hash(generator, *params):
+    """
+    计算测试音频的规格哈希
+
+    包含生成函数的源代码和全部参数：修改生成方式（如振幅处理、静音段位置、计算精度）
+    或参数后哈希随之改变，不会继续复用按旧方式生成的文件
+
+    Args:
+        generator (callable): 实际生成音频数据的函数
+        *params: 决定音频内容的参数
+
+    Returns:
+        str: 12位十六进制哈希
+    """
+    try:
+        source = inspect.getsource(generator)
+    except (OSError, TypeError):
+        # 取不到源代码时（如只有.pyc）退回到函数名
+        source = generator.__qualname__
+    digest = hashlib.sha1(source.encode("utf-8"))
+    digest.update(repr(params).encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def get_cached_wav(file_name, sample_rate, num_samples, write, spec):
+    """
+    获取共用测试音频目录下的16位单声道WAV文件，不存在或参数不符时才生成
+
+    Args:
+        file_name (str): 文件名，应包含决定音频内容的全部参数
+        sample_rate (int): 采样率
+        num_samples (int): 采样点数
+        write (callable): 生成函数，参数为要写入的文件路径
+        spec (str): 规格哈希（见spec_hash），加在文件名中，生成方式改变时使用新文件
+
+    Returns:
+        str: 测试音频文件路径
+    """
+    os.makedirs(SHARED_TONE_DIR, exist_ok=True)
+    stem, extension = os.path.splitext(file_name)
+    output_file = os.path.join(SHARED_TONE_DIR, f"{stem}_{spec}{extension}")
+
+    if not is_matching_wav(output_file, sample_rate, num_samples):
+        # 先写入临时文件再替换，多个测试同时运行时不会读到写了一半的文件
+        temp_file = f"{output_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        write(temp_file)
+        os.replace(temp_file, output_file)
+
+    return output_file
+
+
+@lru_cache(maxsize=None)
+def get_shared_tone(duration, sample_rate=44100, frequency=440, amplitude=0.5):
+    """
+    获取各测试脚本共用的正弦波测试音频文件
+
+    文件保存在系统临时目录下，按参数和规格哈希命名；已存在相同规格的文件时直接复用，
+    测试结束后不删除，供之后的测试和其他测试脚本使用
+
+    Args:
+        duration (float): 时长（秒）
+        sample_rate (int): 采样率
+        frequency (int): 频率（Hz）
+        amplitude (float): 振幅（0-1）
+
+    Returns:
+        str: 测试音频文件路径
+    """
+    return get_cached_wav(f"tone_{frequency}hz_{duration:g}s_{sample_rate}_{amplitude:g}.wav",
+                          sample_rate, int(sample_rate * duration),
+                          lambda path: write_tone(path, frequency, duration, sample_rate, amplitude),
+                          spec_hash(write_tone, frequency, duration, sample_rate, amplitude))
+
+
 def create_test_audio():
-    """创建一个简单的测试音频文件"""
+    """创建一个简单的测试音频文件，已存在相同参数的文件时直接复用"""
     # 生成5秒的正弦波音频（440Hz，A音）
     duration = 5  # 秒
     sample_rate = 44100  # 采样率
     frequency = 440  # 频率（Hz）
     
-    # 生成时间轴
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    output_file = "test_audio.wav"
     
-    # 生成正弦波
-    audio_data = 0.3 * np.sin(2 * np.pi * frequency * t)
+    # 测试音频内容是确定的，文件已存在且参数一致时无需重新生成
+    if is_matching_wav(output_file, sample_rate, int(sample_rate * duration)):
+        print(f"复用已有的测试音频文件: {output_file}")
+        return output_file
     
-    # 保存为WAV文件
-    output_file = "test_audio.wav"
-    sf.write(output_file, audio_data, sample_rate)
+    write_tone(output_file, frequency, duration, sample_rate)
     
     print(f"测试音频文件已创建: {output_file}")
     print(f"时长: {duration}秒")
@@ -6,11 +6,15 @@
 """
 
 import os
+import re
 import sys
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 from pathlib import Path
+from functools import lru_cache
 import math
 
 try:
@@ -20,29 +24,205 @@ try:
     from scipy import signal
     import matplotlib.pyplot as plt
     from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-    from video_processor import VideoProcessor
+    from video_processor import VideoProcessor, DURATION_CACHE_FILE
 except ImportError as e:
     print(f"请安装必要的处理库:")
-    print(f"pip install librosa soundfile numpy scipy matplotlib opencv-python")
+    print(f"pip install librosa soundfile numpy scipy matplotlib opencv-python-headless")
     print(f"错误详情: {e}")
     sys.exit(1)
 
+try:
+    import numpy_rms  # 可选：C+SIMD实现的RMS计算，未安装时使用NumPy计算
+except ImportError:
+    numpy_rms = None
+
+
+RMS_BLOCK_FRAMES = 4096  # 向量化计算RMS时每块的窗口数
+SPLIT_WINDOW_SIZE = 0.01  # 寻找最佳分割点时的分析窗口（秒）
+SEGMENT_WRITE_WORKERS = 4  # 并行保存音频片段的线程数
+VIEWER_MAX_SECONDS = 300  # 波形窗口加载的采样点数上限（按原采样率折算的秒数）
+VIDEO_ROW_DTYPE = np.dtype([('path', object), ('duration', np.float64)])  # 视频列表每行：文件路径、时长（秒）
+NUMBA_MIN_FRAMES = 100000  # 窗口数达到此值时使用numba内核，短音频不值得付出编译开销
+WAVEFORM_LAYOUT = dict(top=0.94, bottom=0.09, left=0.08, right=0.98, hspace=0.35)  # 波形图两个子图的固定边距
+PROGRESS_FLUSH_INTERVAL = 0.03  # 刷新进度显示的最小间隔（秒）
+PREVIEW_DEBOUNCE_MS = 150  # 自定义长度输入停顿此时间（毫秒）后才更新预览和分割点
+SOURCE_CACHE_SIZE = 2  # 缓存解码结果的源音频文件数
+RMS_CACHE_ARRAYS = 3  # 音量分析缓存保留结果的音频数组数（主窗口、波形窗口的预览音频等可同时留在缓存中）
+
+# 自定义长度中的单个数值（不接受nan、inf等float()能解析的特殊值），以及逗号分隔的完整列表
+DURATION_NUMBER = r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+DURATION_PATTERN = re.compile(DURATION_NUMBER)
+DURATION_LIST_PATTERN = re.compile(rf'\s*{DURATION_NUMBER}\s*(?:,\s*{DURATION_NUMBER}\s*)*')
+
+
+@lru_cache(maxsize=None)
+def get_rolling_mean_square_kernel():
+    """
+    获取numba编译的滑动均方值内核（首次调用时导入numba并编译）
+
+    内核维护窗口内平方和，每移动一个步长只加上新进入、减去移出的采样点，
+    把平方和求和融合在一个循环里，不产生中间数组
+
+    Returns:
+        callable: kernel(audio_data, num_frames, window_samples, step_samples)，
+                  numba不可用或编译失败时返回None
+    """
+    try:
+        from numba import njit
+
+        @njit(cache=True)
+        def rolling_mean_square(audio_data, num_frames, window_samples, step_samples):
+            mean_square = np.empty(num_frames, dtype=np.float32)
+
+            # 平方和使用float64累加，避免长音频上加减累积误差
+            square_sum = 0.0
+            for j in range(window_samples):
+                square_sum += float(audio_data[j]) * audio_data[j]
+            mean_square[0] = square_sum / window_samples
+
+            for k in range(1, num_frames):
+                old_start = (k - 1) * step_samples
+                new_start = old_start + window_samples
+                for j in range(step_samples):
+                    square_sum -= float(audio_data[old_start + j]) * audio_data[old_start + j]
+                    square_sum += float(audio_data[new_start + j]) * audio_data[new_start + j]
+                mean_square[k] = max(square_sum, 0.0) / window_samples
+
+            return mean_square
+
+        # 预先编译，编译失败（如打包环境无法写入缓存）时不使用numba
+        rolling_mean_square(np.zeros(4, dtype=np.float32), 1, 2, 1)
+        return rolling_mean_square
+    except Exception:
+        return None
+
+
+def compute_waveform_envelope(audio_data, sample_rate, width_px):
+    """
+    计算用于显示的波形包络
+
+    将音频按图形宽度分桶（每个像素列约两个桶），每桶取最小值和最大值交替连线，
+    保留峰值且绘图点数与音频长度无关
+
+    Args:
+        audio_data: 音频数据
+        sample_rate: 采样率
+        width_px (int): 图形宽度（像素）
+
+    Returns:
+        tuple: (时间轴, 包络数据)
+    """
+    bucket = max(1, len(audio_data) // (width_px * 2))
+
+    if bucket == 1:
+        # 音频很短，直接显示全部采样点（时间轴为各采样点的准确时刻）
+        return np.arange(len(audio_data)) / sample_rate, audio_data
+
+    # 每桶的最小值和最大值交替排列，末尾不足一桶的采样点忽略
+    num_buckets = len(audio_data) // bucket
+    buckets = audio_data[:num_buckets * bucket].reshape(num_buckets, bucket)
+    envelope = np.empty(num_buckets * 2, dtype=audio_data.dtype)
+    envelope[0::2] = buckets.min(axis=1)
+    envelope[1::2] = buckets.max(axis=1)
+    time_axis = np.arange(num_buckets * 2) * (bucket / 2 / sample_rate)
+
+    return time_axis, envelope
+
 
 class AudioSplitter:
     """音频分割核心类"""
     
-    def __init__(self):
+    def __init__(self, video_cache_file=None):
+        """
+        Args:
+            video_cache_file (str, optional): 视频时长缓存文件路径，为None时不读写磁盘缓存
+        """
         self.supported_formats = ['.mp3', '.wav']
-        self.video_processor = VideoProcessor()
+        self._supported_suffixes = frozenset(self.supported_formats)  # 用于格式检查的集合，查找为O(1)
+        self.video_processor = VideoProcessor(cache_file=video_cache_file)
+        # 音量分析结果缓存 {id(音频数据): (音频数据, {(曲线类型, 采样率, 窗口大小): (时间轴, 数值数组)})}
+        # 按最近使用顺序排列，最多保留RMS_CACHE_ARRAYS段音频；
+        # 缓存中保存音频数据的引用，保证id在缓存有效期内不会被复用
+        self._rms_cache = {}
+        # 源音频解码结果缓存 {文件路径: (修改时间, 文件大小, 音频数据, 采样率)}
+        self._source_cache = {}
+        # 界面的加载线程、分割线程和波形窗口共用同一个分割器，两个缓存的读写都在锁内进行
+        # （解码和计算本身在锁外，不会互相阻塞）
+        self._cache_lock = threading.Lock()
     
     def is_supported_format(self, file_path):
         """检查文件格式是否支持"""
-        return Path(file_path).suffix.lower() in self.supported_formats
+        return os.path.splitext(file_path)[1].lower() in self._supported_suffixes
+
+    def load_audio(self, file_path):
+        """
+        加载音频文件（保持原采样率，多声道混合为单声道）
+
+        直接用soundfile解码为float32，不经过librosa的加载流程；
+        libsndfile无法解码的文件回退到librosa.load
+
+        Args:
+            file_path (str): 音频文件路径
+
+        Returns:
+            tuple: (音频数据, 采样率)
+        """
+        try:
+            audio_data, sample_rate = sf.read(file_path, dtype='float32', always_2d=False)
+        except RuntimeError:
+            return librosa.load(file_path, sr=None)
+
+        # 与librosa.load一致，多声道取平均混合为单声道
+        if audio_data.ndim > 1:
+            audio_data = audio_data.mean(axis=1, dtype=np.float32)
+
+        return audio_data, sample_rate
+
+    def load_audio_cached(self, file_path):
+        """
+        加载音频文件（已缓存），供分割、主界面和波形窗口共用
+
+        同一文件多次加载时只解码一次；文件的修改时间或大小变化后重新解码。
+        多次调用返回同一个数组，音量分析缓存也因此可以复用；返回的数组不应被修改
+
+        Args:
+            file_path (str): 音频文件路径
+
+        Returns:
+            tuple: (音频数据, 采样率)
+        """
+        stat = os.stat(file_path)
+        with self._cache_lock:
+            cached = self._source_cache.get(file_path)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2], cached[3]
+
+        audio_data, sample_rate = self.load_audio(file_path)
+
+        with self._cache_lock:
+            # 超出容量时淘汰最早加入的文件
+            self._source_cache.pop(file_path, None)
+            while len(self._source_cache) >= SOURCE_CACHE_SIZE:
+                del self._source_cache[next(iter(self._source_cache))]
+            self._source_cache[file_path] = (stat.st_mtime_ns, stat.st_size, audio_data, sample_rate)
+
+        return audio_data, sample_rate
+
+    @staticmethod
+    def _window_params(sample_rate, window_size):
+        """计算分析窗口大小和步长（采样点数）"""
+        window_samples = int(window_size * sample_rate)
+        # 使用更小的步长：窗口大小的1/4，提高时间精度
+        step_samples = max(1, window_samples // 4)
+        return window_samples, step_samples
 
     def analyze_audio_volume(self, audio_data, sample_rate, window_size=0.02):
         """
         分析音频的音量变化
 
+        同一段音频的分析结果会被缓存，波形显示、静音检测和多次寻找分割点共用一次计算；
+        返回的数组不应被修改
+
         Args:
             audio_data: 音频数据
             sample_rate: 采样率
@@ -51,24 +231,86 @@ class AudioSplitter:
         Returns:
             tuple: (时间轴, RMS音量数组)
         """
-        # 计算窗口大小（采样点数）
-        window_samples = int(window_size * sample_rate)
+        time_points, mean_square = self._mean_square_curve(audio_data, sample_rate, window_size)
+        return self._get_cached_curve("rms", audio_data, sample_rate, window_size,
+                                      lambda: (time_points, np.sqrt(mean_square)))
 
-        # 计算RMS音量，使用更小的步长提高精度
-        rms_values = []
-        time_points = []
+    def _mean_square_curve(self, audio_data, sample_rate, window_size=0.02):
+        """
+        获取音频的窗口均方值曲线（已缓存）
 
-        # 使用更小的步长：窗口大小的1/4，提高时间精度
-        step_samples = max(1, window_samples // 4)
+        静音检测和寻找最低音量点只需比较大小，直接使用均方值，省去开方
+
+        Returns:
+            tuple: (时间轴, 均方值数组)
+        """
+        return self._get_cached_curve("mean_square", audio_data, sample_rate, window_size,
+                                      lambda: self._compute_mean_square(audio_data, sample_rate, window_size))
+
+    def _get_cached_curve(self, kind, audio_data, sample_rate, window_size, compute):
+        """
+        从缓存获取分析曲线，未命中时调用compute计算并缓存
+
+        缓存按音频数组分组，只淘汰最久未使用的音频的结果，
+        主窗口、波形窗口和分割线程使用不同音频时不会互相清空对方的结果
+        """
+        array_key = id(audio_data)
+        curve_key = (kind, sample_rate, window_size)
+        with self._cache_lock:
+            entry = self._rms_cache.pop(array_key, None)
+            if entry is not None:
+                # 重新插入到末尾，标记为最近使用
+                self._rms_cache[array_key] = entry
+                cached = entry[1].get(curve_key)
+                if cached is not None:
+                    return cached
+
+        time_points, values = compute()
+
+        with self._cache_lock:
+            entry = self._rms_cache.pop(array_key, None) or (audio_data, {})
+            entry[1][curve_key] = (time_points, values)
+            self._rms_cache[array_key] = entry
+            # 超出容量时淘汰最久未使用的音频
+            while len(self._rms_cache) > RMS_CACHE_ARRAYS:
+                del self._rms_cache[next(iter(self._rms_cache))]
+        return time_points, values
+
+    def _compute_mean_square(self, audio_data, sample_rate, window_size):
+        """计算音频的窗口均方值曲线（不使用缓存）"""
+        window_samples, step_samples = self._window_params(sample_rate, window_size)
+
+        # 窗口起点为 0, step, 2*step, ... （小于 len - window_samples）
+        num_frames = len(range(0, len(audio_data) - window_samples, step_samples))
+        if num_frames == 0:
+            return np.array([]), np.array([], dtype=np.float32)
+
+        if numpy_rms is not None and audio_data.ndim == 1 and window_samples % step_samples == 0:
+            # numpy_rms只支持单声道、不重叠的窗口：窗口大小是步长的整数倍时（如48kHz），
+            # 先算每个步长小块的均方值，窗口的均方值就是其中各小块均方值的平均
+            blocks_per_window = window_samples // step_samples
+            covered_samples = (num_frames - 1) * step_samples + window_samples
+            block_mean_square = np.square(numpy_rms.rms(
+                np.ascontiguousarray(audio_data[:covered_samples], dtype=np.float32), step_samples))
+            mean_square = (np.lib.stride_tricks.sliding_window_view(block_mean_square, blocks_per_window)
+                           .mean(axis=1, dtype=np.float32))
+        elif (num_frames >= NUMBA_MIN_FRAMES and audio_data.ndim == 1
+              and get_rolling_mean_square_kernel() is not None):
+            # 长音频使用numba内核，每个采样点只参与两次运算
+            mean_square = get_rolling_mean_square_kernel()(audio_data, num_frames, window_samples, step_samples)
+        else:
+            # 用滑动窗口视图一次取出所有窗口（不复制数据），按块向量化计算，
+            # 每块的平方中间结果大小固定，避免长音频占用过多内存
+            frames = np.lib.stride_tricks.sliding_window_view(audio_data, window_samples)[::step_samples][:num_frames]
+            mean_square = np.empty(num_frames, dtype=np.float32)
+            for start in range(0, num_frames, RMS_BLOCK_FRAMES):
+                block = frames[start:start + RMS_BLOCK_FRAMES]
+                mean_square[start:start + len(block)] = np.square(block).mean(axis=1, dtype=np.float32)
 
-        for i in range(0, len(audio_data) - window_samples, step_samples):
-            window_data = audio_data[i:i + window_samples]
-            rms = np.sqrt(np.mean(window_data ** 2))
-            rms_values.append(rms)
-            # 使用更精确的时间计算
-            time_points.append(i / sample_rate)
+        # 使用更精确的时间计算
+        time_points = np.arange(num_frames) * step_samples / sample_rate
 
-        return np.array(time_points), np.array(rms_values)
+        return time_points, mean_square
 
     def find_silence_regions(self, audio_data, sample_rate, silence_threshold=0.01, min_silence_duration=0.1):
         """
@@ -83,37 +325,24 @@ class AudioSplitter:
         Returns:
             list: 静音区域列表 [(start_time, end_time), ...]
         """
-        time_points, rms_values = self.analyze_audio_volume(audio_data, sample_rate)
-
-        # 找到低于阈值的区域
-        silence_mask = rms_values < silence_threshold
-
-        # 找到连续的静音区域
-        silence_regions = []
-        in_silence = False
-        silence_start = 0
-
-        for i, is_silent in enumerate(silence_mask):
-            if is_silent and not in_silence:
-                # 静音开始
-                in_silence = True
-                silence_start = time_points[i]
-            elif not is_silent and in_silence:
-                # 静音结束
-                in_silence = False
-                silence_end = time_points[i]
-
-                # 检查静音持续时间
-                if silence_end - silence_start >= min_silence_duration:
-                    silence_regions.append((silence_start, silence_end))
-
-        # 处理音频结尾的静音
-        if in_silence:
-            silence_end = time_points[-1] if len(time_points) > 0 else 0
-            if silence_end - silence_start >= min_silence_duration:
-                silence_regions.append((silence_start, silence_end))
-
-        return silence_regions
+        time_points, mean_square = self._mean_square_curve(audio_data, sample_rate)
+
+        # 找到低于阈值的区域（RMS < 阈值 等价于 均方值 < 阈值的平方，无需开方）
+        silence_mask = mean_square < np.float32(silence_threshold) ** 2
+
+        # 两端补False后求差分，+1处为静音开始，-1处为静音结束（第一个非静音窗口）
+        edges = np.diff(np.concatenate(([False], silence_mask, [False])).astype(np.int8))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+
+        # 静音结束于第一个非静音窗口；持续到结尾的静音结束于最后一个窗口
+        start_times = time_points[starts]
+        end_times = time_points[np.minimum(ends, len(time_points) - 1)]
+
+        # 检查静音持续时间
+        keep = end_times - start_times >= min_silence_duration
+
+        return list(zip(start_times[keep].tolist(), end_times[keep].tolist()))
 
     def find_optimal_split_point(self, audio_data, sample_rate, target_time, search_range=2.0):
         """
@@ -132,23 +361,24 @@ class AudioSplitter:
         start_time = max(0, target_time - search_range / 2)
         end_time = min(len(audio_data) / sample_rate, target_time + search_range / 2)
 
-        # 获取搜索范围内的音频数据
+        # 获取搜索范围的采样点
         start_sample = int(start_time * sample_rate)
         end_sample = int(end_time * sample_rate)
-        search_audio = audio_data[start_sample:end_sample]
 
-        if len(search_audio) == 0:
-            return target_time
+        # 使用整段音频的均方值曲线（已缓存，最小均方值即最小RMS），使用更高精度的窗口
+        time_points, mean_square = self._mean_square_curve(audio_data, sample_rate, window_size=SPLIT_WINDOW_SIZE)
 
-        # 分析这段音频的音量，使用更高精度
-        time_points, rms_values = self.analyze_audio_volume(search_audio, sample_rate, window_size=0.01)
+        # 完全落在搜索范围内的窗口：起点 >= start_sample 且 终点 <= end_sample
+        window_samples, step_samples = self._window_params(sample_rate, SPLIT_WINDOW_SIZE)
+        start_idx = -(-start_sample // step_samples)
+        end_idx = min(len(mean_square), -(-(end_sample - window_samples) // step_samples))
 
-        if len(rms_values) == 0:
+        if end_idx <= start_idx:
             return target_time
 
         # 找到音量最低的点
-        min_volume_idx = np.argmin(rms_values)
-        optimal_time = start_time + time_points[min_volume_idx]
+        min_volume_idx = start_idx + np.argmin(mean_square[start_idx:end_idx])
+        optimal_time = time_points[min_volume_idx]
 
         # 确保精度：四舍五入到最近的采样点
         optimal_sample = round(optimal_time * sample_rate)
@@ -157,7 +387,7 @@ class AudioSplitter:
         return optimal_time
     
     def split_audio(self, file_path, segment_duration=None, custom_durations=None,
-                   smart_split=False, search_range=2.0, progress_callback=None):
+                   smart_split=False, search_range=2.0, progress_callback=None, output_dir=None):
         """
         分割音频文件
 
@@ -168,6 +398,7 @@ class AudioSplitter:
             smart_split (bool): 是否启用智能分割
             search_range (float): 智能分割搜索范围（秒）
             progress_callback (callable): 进度回调函数
+            output_dir (str, optional): 输出目录，默认为音频文件所在目录下的output目录
 
         Returns:
             tuple: (success, message, output_files)
@@ -192,8 +423,8 @@ class AudioSplitter:
             if progress_callback:
                 progress_callback(0, "正在加载音频文件...")
 
-            # 使用librosa加载音频文件
-            audio_data, sample_rate = librosa.load(file_path, sr=None)
+            # 加载音频文件（同一文件重复分割时复用解码结果）
+            audio_data, sample_rate = self.load_audio_cached(file_path)
 
             # 计算分割参数
             total_duration = len(audio_data) / sample_rate  # 秒
@@ -202,17 +433,19 @@ class AudioSplitter:
             if custom_durations is not None:
                 # 自定义长度模式
                 return self._split_audio_custom(audio_data, sample_rate, total_duration,
-                                              custom_durations, file_path, smart_split, search_range, progress_callback)
+                                              custom_durations, file_path, smart_split, search_range, progress_callback,
+                                              output_dir)
             else:
                 # 固定时长模式（原有逻辑）
                 return self._split_audio_fixed(audio_data, sample_rate, total_duration,
-                                             segment_duration, file_path, smart_split, search_range, progress_callback)
+                                             segment_duration, file_path, smart_split, search_range, progress_callback,
+                                             output_dir)
 
         except Exception as e:
             return False, f"分割过程中发生错误: {str(e)}", []
 
     def split_audio_by_video_durations(self, audio_file_path, video_durations,
-                                     smart_split=False, search_range=2.0, progress_callback=None):
+                                     smart_split=False, search_range=2.0, progress_callback=None, output_dir=None):
         """
         根据视频时长列表分割音频
 
@@ -222,6 +455,7 @@ class AudioSplitter:
             smart_split (bool): 是否启用智能分割
             search_range (float): 智能分割搜索范围（秒）
             progress_callback (callable): 进度回调函数
+            output_dir (str, optional): 输出目录，默认为音频文件所在目录下的output目录
 
         Returns:
             tuple: (success, message, output_files)
@@ -248,13 +482,14 @@ class AudioSplitter:
                 custom_durations=video_durations,
                 smart_split=smart_split,
                 search_range=search_range,
-                progress_callback=progress_callback
+                progress_callback=progress_callback,
+                output_dir=output_dir
             )
 
         except Exception as e:
             return False, f"视频时长匹配分割过程中发生错误: {str(e)}", []
 
-    def _split_audio_fixed(self, audio_data, sample_rate, total_duration, segment_duration, file_path, smart_split, search_range, progress_callback):
+    def _split_audio_fixed(self, audio_data, sample_rate, total_duration, segment_duration, file_path, smart_split, search_range, progress_callback, output_dir=None):
         """固定时长分割模式"""
         if segment_duration >= total_duration:
             return False, "分割时长大于或等于音频总时长", []
@@ -264,69 +499,49 @@ class AudioSplitter:
 
         # 创建输出目录
         input_path = Path(file_path)
-        output_dir = input_path.parent / "output"
-        output_dir.mkdir(exist_ok=True)
+        output_dir = Path(output_dir) if output_dir is not None else input_path.parent / "output"
+        output_dir.mkdir(parents=True, exist_ok=True)
 
         # 生成输出文件名前缀
         base_name = input_path.stem
         file_extension = input_path.suffix
 
-        output_files = []
-
         # 计算分割点 - 所有模式都使用高精度算法
-        split_points = []
-        current_position = 0
-        split_points.append(current_position)  # 起始点
+        if smart_split:
+            # 智能分割：每个目标点取决于上一个实际分割点，需要逐个寻找
+            split_points = [0]  # 起始点
+            current_position = 0
 
-        for i in range(1, num_segments):
-            target_time = current_position + segment_duration
-
-            if smart_split:
-                # 智能分割：寻找最佳分割点
+            for i in range(1, num_segments):
+                target_time = current_position + segment_duration
                 optimal_time = self.find_optimal_split_point(audio_data, sample_rate, target_time, search_range)
                 split_points.append(optimal_time)
                 current_position = optimal_time  # 更新当前位置，确保下一段从这里开始
-            else:
-                # 高精度固定分割：确保分割点对齐到采样点边界
-                # 使用round()确保精确对齐到采样点
-                target_sample = round(target_time * sample_rate)
-                precise_time = target_sample / sample_rate
-                split_points.append(precise_time)
-                current_position = precise_time  # 更新当前位置，确保连续性
+        else:
+            # 高精度固定分割：第i个分割点直接取 i * 分割时长，四舍五入对齐到采样点边界，
+            # 各分割点互不依赖，不会累积舍入误差
+            target_samples = np.round(np.arange(1, num_segments) * (segment_duration * sample_rate))
+            split_points = [0] + (target_samples / sample_rate).tolist()
 
         split_points.append(total_duration)  # 添加结束点
 
-        # 执行分割
-        for i in range(num_segments):
-            start_time = split_points[i]
-            end_time = split_points[i + 1]
-
-            # 使用round()提高精度，避免截断误差
-            start_sample = round(start_time * sample_rate)
-            end_sample = round(end_time * sample_rate)
-            end_sample = min(end_sample, len(audio_data))
-
-            # 提取音频片段
-            segment_data = audio_data[start_sample:end_sample]
+        # 一次性把所有分割点换算为采样点，使用四舍五入避免截断误差，并确保不超出音频范围
+        sample_bounds = self._split_points_to_samples(split_points, sample_rate, len(audio_data))
 
+        # 提取所有音频片段（切片为视图，不复制数据）
+        segments = []
+        for i in range(num_segments):
             # 生成输出文件名
             output_filename = f"{base_name}_part_{i+1:03d}{file_extension}"
-            output_path = output_dir / output_filename
-
-            # 保存音频片段
-            sf.write(str(output_path), segment_data, sample_rate)
-            output_files.append(str(output_path))
-
-            # 更新进度
-            if progress_callback:
-                progress = int((i + 1) / num_segments * 100)
-                split_type = "智能" if smart_split else "固定"
-                progress_callback(progress, f"正在{split_type}分割第 {i+1}/{num_segments} 个片段...")
+            segments.append((output_dir / output_filename, audio_data[sample_bounds[i]:sample_bounds[i + 1]]))
 
+        # 并行保存音频片段
         split_type = "智能" if smart_split else "固定"
+        output_files = self._write_segments(segments, sample_rate, split_type, progress_callback)
+
         return True, f"{split_type}分割完成！共生成 {num_segments} 个文件", output_files
 
-    def _split_audio_custom(self, audio_data, sample_rate, total_duration, custom_durations, file_path, smart_split, search_range, progress_callback):
+    def _split_audio_custom(self, audio_data, sample_rate, total_duration, custom_durations, file_path, smart_split, search_range, progress_callback, output_dir=None):
         """自定义长度分割模式"""
         # 验证自定义长度数组
         if not custom_durations or len(custom_durations) == 0:
@@ -350,20 +565,15 @@ class AudioSplitter:
         # 确定是否创建最后一段
         create_last_segment = last_segment_duration >= 1.0  # 最后一段至少1秒
 
-        # 计算总段数
-        total_segments = len(custom_durations) + (1 if create_last_segment else 0)
-
         # 创建输出目录
         input_path = Path(file_path)
-        output_dir = input_path.parent / "output"
-        output_dir.mkdir(exist_ok=True)
+        output_dir = Path(output_dir) if output_dir is not None else input_path.parent / "output"
+        output_dir.mkdir(parents=True, exist_ok=True)
 
         # 生成输出文件名前缀
         base_name = input_path.stem
         file_extension = input_path.suffix
 
-        output_files = []
-
         # 计算分割点
         split_points = [0]  # 起始点
         current_position = 0
@@ -383,67 +593,83 @@ class AudioSplitter:
                 split_points.append(precise_time)
                 current_position = precise_time  # 更新当前位置，确保连续性
 
-        # 分割指定长度的段
-        for i, duration in enumerate(custom_durations):
-            start_time = split_points[i]
-            end_time = split_points[i + 1]
-
-            # 使用round()提高精度，避免截断误差
-            start_sample = round(start_time * sample_rate)
-            end_sample = round(end_time * sample_rate)
-
-            # 确保不超出音频范围
-            end_sample = min(end_sample, len(audio_data))
-
-            # 提取音频片段
-            segment_data = audio_data[start_sample:end_sample]
+        # 一次性把所有分割点换算为采样点，使用四舍五入避免截断误差，并确保不超出音频范围
+        sample_bounds = self._split_points_to_samples(split_points, sample_rate, len(audio_data))
 
+        # 提取所有音频片段（切片为视图，不复制数据）
+        segments = []
+        for i in range(len(custom_durations)):
             # 生成输出文件名
             output_filename = f"{base_name}_part_{i+1:03d}{file_extension}"
-            output_path = output_dir / output_filename
-
-            # 保存音频片段
-            sf.write(str(output_path), segment_data, sample_rate)
-            output_files.append(str(output_path))
-
-            # 更新进度
-            if progress_callback:
-                progress = int((i + 1) / total_segments * 100)
-                split_type = "智能" if smart_split else "自定义"
-                progress_callback(progress, f"正在{split_type}分割第 {i+1}/{total_segments} 个片段...")
+            segments.append((output_dir / output_filename, audio_data[sample_bounds[i]:sample_bounds[i + 1]]))
 
         # 处理最后一段（如果需要）
         if create_last_segment:
-            start_time = split_points[-1]
-            # 使用round()提高精度
-            start_sample = round(start_time * sample_rate)
-            end_sample = len(audio_data)
-
-            # 提取音频片段
-            segment_data = audio_data[start_sample:end_sample]
-
             # 生成输出文件名
             segment_index = len(custom_durations) + 1
             output_filename = f"{base_name}_part_{segment_index:03d}{file_extension}"
-            output_path = output_dir / output_filename
+            segments.append((output_dir / output_filename, audio_data[sample_bounds[-1]:]))
 
-            # 保存音频片段
-            sf.write(str(output_path), segment_data, sample_rate)
-            output_files.append(str(output_path))
-
-            # 更新进度
-            if progress_callback:
-                split_type = "智能" if smart_split else "自定义"
-                progress_callback(100, f"正在{split_type}分割第 {total_segments}/{total_segments} 个片段...")
+        # 并行保存音频片段
+        split_type = "智能" if smart_split else "自定义"
+        output_files = self._write_segments(segments, sample_rate, split_type, progress_callback)
 
         # 生成结果消息
-        split_type = "智能" if smart_split else "自定义"
         message = f"{split_type}分割完成！共生成 {len(output_files)} 个文件"
         if not create_last_segment:
             message += f"（最后一段时长{last_segment_duration:.1f}秒，小于1秒，已跳过）"
 
         return True, message, output_files
 
+    @staticmethod
+    def _split_points_to_samples(split_points, sample_rate, num_samples):
+        """
+        将分割时间点换算为采样点位置
+
+        Args:
+            split_points (list): 分割时间点列表（秒）
+            sample_rate: 采样率
+            num_samples (int): 音频总采样点数
+
+        Returns:
+            numpy.ndarray: 采样点位置数组，四舍五入到最近的采样点并限制在音频范围内
+        """
+        sample_bounds = np.round(np.asarray(split_points, dtype=np.float64) * sample_rate).astype(np.int64)
+        return np.clip(sample_bounds, 0, num_samples)
+
+    def _write_segments(self, segments, sample_rate, split_type, progress_callback=None):
+        """
+        使用线程池并行保存音频片段
+
+        libsndfile写文件时会释放GIL，多个片段的编码和磁盘写入可以同时进行；
+        进度回调仍在调用线程中按完成顺序触发
+
+        Args:
+            segments (list): [(输出路径, 音频数据), ...]
+            sample_rate: 采样率
+            split_type (str): 分割类型，用于进度提示
+            progress_callback (callable): 进度回调函数
+
+        Returns:
+            list: 输出文件路径列表（按片段顺序）
+        """
+        total_segments = len(segments)
+
+        with ThreadPoolExecutor(max_workers=SEGMENT_WRITE_WORKERS) as executor:
+            futures = [executor.submit(sf.write, str(output_path), segment_data, sample_rate)
+                       for output_path, segment_data in segments]
+
+            for completed, future in enumerate(as_completed(futures), 1):
+                # 写入失败时抛出异常，由split_audio统一处理
+                future.result()
+
+                # 更新进度
+                if progress_callback:
+                    progress = int(completed / total_segments * 100)
+                    progress_callback(progress, f"正在{split_type}分割第 {completed}/{total_segments} 个片段...")
+
+        return [str(output_path) for output_path, _ in segments]
+
 
 class WaveformViewer:
     """音频波形可视化窗口"""
@@ -457,6 +683,9 @@ class WaveformViewer:
         self.split_points = []
         self.selected_point_index = None
         self.dragging = False
+        self._envelope = None  # 波形显示包络缓存 (音频数据, 时间轴, 包络)
+        self._background = None  # 不含分割线的画布背景，用于快速重绘分割线
+        self._split_artists = []  # 每个分割点在两个子图中的竖线 [(ax1线, ax2线), ...]
 
         # 创建新窗口
         self.window = tk.Toplevel(parent)
@@ -499,6 +728,7 @@ class WaveformViewer:
 
         # 波形显示区域
         self.figure = plt.Figure(figsize=(12, 6), dpi=80)
+        self.figure.subplots_adjust(**WAVEFORM_LAYOUT)
         self.canvas = FigureCanvasTkAgg(self.figure, main_frame)
         self.canvas.get_tk_widget().grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
@@ -506,16 +736,44 @@ class WaveformViewer:
         self.canvas.mpl_connect('button_press_event', self.on_mouse_press)
         self.canvas.mpl_connect('button_release_event', self.on_mouse_release)
         self.canvas.mpl_connect('motion_notify_event', self.on_mouse_motion)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
 
     def load_and_display_audio(self):
-        """加载并显示音频波形"""
+        """在后台线程加载音频，完成后回到主线程显示波形，加载期间界面保持响应"""
+        threading.Thread(target=self._load_audio_in_background, daemon=True).start()
+
+    def _load_audio_in_background(self):
+        """后台线程：解码音频并预先完成音量分析"""
         try:
-            # 加载音频文件
-            self.audio_data, self.sample_rate = librosa.load(self.audio_file, sr=None)
+            # 加载音频文件（长音频只加载用于显示的抽样数据）
+            audio_data, sample_rate, source_sample_rate = self.load_preview_audio()
+
+            # 预先计算音量曲线和静音区域，结果缓存在splitter中，绘图时直接复用
+            self.splitter.analyze_audio_volume(audio_data, sample_rate)
+            self.splitter.find_silence_regions(audio_data, sample_rate)
+
+            result = (self._finish_load, audio_data, sample_rate, source_sample_rate)
+        except Exception as e:
+            result = (self._show_load_error, str(e))
+
+        try:
+            self.window.after(0, *result)
+        except tk.TclError:
+            # 加载完成前窗口已关闭
+            pass
+
+    def _show_load_error(self, error):
+        """显示加载失败信息"""
+        self.info_label.config(text=f"加载失败: {error}")
+
+    def _finish_load(self, audio_data, sample_rate, source_sample_rate):
+        """主线程：保存加载结果并绘制波形"""
+        try:
+            self.audio_data, self.sample_rate = audio_data, sample_rate
             total_duration = len(self.audio_data) / self.sample_rate
 
             # 更新信息
-            info_text = f"文件: {os.path.basename(self.audio_file)} | 时长: {total_duration:.1f}秒 | 采样率: {self.sample_rate}Hz"
+            info_text = f"文件: {os.path.basename(self.audio_file)} | 时长: {total_duration:.1f}秒 | 采样率: {source_sample_rate}Hz"
             info_text += f" | 分割点: {len(self.split_points)}个"
             if self.selected_point_index is not None:
                 info_text += f" | 选中: 第{self.selected_point_index + 1}个点"
@@ -526,7 +784,53 @@ class WaveformViewer:
             self.draw_waveform()
 
         except Exception as e:
-            self.info_label.config(text=f"加载失败: {str(e)}")
+            self._show_load_error(str(e))
+
+    def load_preview_audio(self):
+        """
+        加载用于显示的音频数据
+
+        超过VIEWER_MAX_SECONDS的音频每factor个采样点为一组，依次取每组的最小值和最大值，
+        组内的瞬态峰值都会保留在波形中（逐点抽取会漏掉峰值并产生混叠）；分块读取，
+        内存占用与音频时长无关；分割时仍由split_audio读取完整音频。
+        预览数据的音量曲线按组内峰值计算，比原音频的RMS略高，只用于显示
+
+        Returns:
+            tuple: (音频数据, 预览数据的采样率, 原采样率)
+        """
+        try:
+            info = sf.info(self.audio_file)
+        except RuntimeError:
+            # libsndfile无法读取的文件整体加载
+            audio_data, sample_rate = self.splitter.load_audio_cached(self.audio_file)
+            return audio_data, sample_rate, sample_rate
+
+        max_samples = int(VIEWER_MAX_SECONDS * info.samplerate)
+        if info.frames <= max_samples:
+            # 与主界面和分割共用缓存的解码结果，音量分析结果也随之复用
+            audio_data, sample_rate = self.splitter.load_audio_cached(self.audio_file)
+            return audio_data, sample_rate, sample_rate
+
+        # 每组输出最小值、最大值两个点，组大小按总点数不超过max_samples计算；
+        # 块大小取组大小的整数倍，保证只有最后一块可能包含不完整的组
+        factor = -(-2 * info.frames // max_samples)
+        blocks = [self._min_max_groups(block.mean(axis=1, dtype=np.float32), factor)
+                  for block in sf.blocks(self.audio_file, blocksize=factor * 65536, dtype='float32', always_2d=True)]
+
+        return np.concatenate(blocks), 2 * info.samplerate / factor, info.samplerate
+
+    @staticmethod
+    def _min_max_groups(mono, factor):
+        """把单声道数据每factor个采样点分为一组，返回交替排列的各组最小值和最大值"""
+        full = len(mono) // factor * factor
+        groups = mono[:full].reshape(-1, factor)
+        pairs = np.empty((len(groups) + (full < len(mono)), 2), dtype=np.float32)
+        pairs[:len(groups), 0] = groups.min(axis=1)
+        pairs[:len(groups), 1] = groups.max(axis=1)
+        if full < len(mono):
+            # 末尾不足一组的采样点单独作为一组
+            pairs[-1] = mono[full:].min(), mono[full:].max()
+        return pairs.ravel()
 
     def draw_waveform(self):
         """绘制音频波形"""
@@ -540,11 +844,9 @@ class WaveformViewer:
         ax1 = self.figure.add_subplot(2, 1, 1)
         ax2 = self.figure.add_subplot(2, 1, 2)
 
-        # 时间轴
-        time_axis = np.linspace(0, len(self.audio_data) / self.sample_rate, len(self.audio_data))
-
-        # 绘制波形
-        ax1.plot(time_axis, self.audio_data, color='blue', alpha=0.7, linewidth=0.5)
+        # 绘制波形（按屏幕分辨率降采样的包络）
+        time_axis, envelope = self.get_waveform_envelope()
+        ax1.plot(time_axis, envelope, color='blue', alpha=0.7, linewidth=0.5)
         ax1.set_title('音频波形')
         ax1.set_ylabel('振幅')
         ax1.grid(True, alpha=0.3)
@@ -565,20 +867,74 @@ class WaveformViewer:
             ax2.axvspan(start, end, alpha=0.3, color='yellow')
 
         # 标记分割点（如果有）
-        if self.split_points:
-            for i, point in enumerate(self.split_points):
-                # 选中的点用红色，其他用绿色
-                color = 'red' if i == self.selected_point_index else 'green'
-                linewidth = 3 if i == self.selected_point_index else 2
-
-                ax1.axvline(x=point, color=color, linestyle='--', alpha=0.8, linewidth=linewidth,
-                           label=f'分割点{i+1}' if i == 0 else '')
-                ax2.axvline(x=point, color=color, linestyle='--', alpha=0.8, linewidth=linewidth)
+        # 分割线设为animated，不画进背景，拖拽时只重绘分割线
+        self._split_artists = []
+        for i, point in enumerate(self.split_points):
+            line1 = ax1.axvline(x=point, linestyle='--', alpha=0.8, animated=True,
+                                label=f'分割点{i+1}' if i == 0 else '')
+            line2 = ax2.axvline(x=point, linestyle='--', alpha=0.8, animated=True)
+            self._split_artists.append((line1, line2))
+        self._style_split_lines()
 
-        # 调整布局
-        self.figure.tight_layout()
         self.canvas.draw()
 
+    def _style_split_lines(self):
+        """按当前分割点位置和选中状态设置分割线"""
+        for i, (point, lines) in enumerate(zip(self.split_points, self._split_artists)):
+            # 选中的点用红色，其他用绿色
+            color = 'red' if i == self.selected_point_index else 'green'
+            linewidth = 3 if i == self.selected_point_index else 2
+
+            for line in lines:
+                line.set_xdata([point, point])
+                line.set_color(color)
+                line.set_linewidth(linewidth)
+
+    def _draw_split_lines(self):
+        """在画布上绘制分割线"""
+        for lines in self._split_artists:
+            for line in lines:
+                self.figure.draw_artist(line)
+
+    def on_draw(self, event):
+        """画布完整重绘后（包括窗口缩放）保存背景并画出分割线"""
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_split_lines()
+
+    def update_split_lines(self):
+        """
+        只重绘分割线
+
+        恢复保存的背景后重画分割线并blit，不重新绘制波形、音量和静音区域；
+        分割点数量变化时需要重新创建竖线，回退到完整重绘
+        """
+        if self._background is None or len(self._split_artists) != len(self.split_points):
+            self.draw_waveform()
+            return
+
+        self.canvas.restore_region(self._background)
+        self._style_split_lines()
+        self._draw_split_lines()
+        self.canvas.blit(self.figure.bbox)
+
+    def get_waveform_envelope(self):
+        """
+        获取用于显示的波形包络
+
+        包络按音频数据缓存，拖拽和刷新时直接复用
+
+        Returns:
+            tuple: (时间轴, 包络数据)
+        """
+        if self._envelope is not None and self._envelope[0] is self.audio_data:
+            return self._envelope[1], self._envelope[2]
+
+        width_px = int(self.figure.get_figwidth() * self.figure.dpi)
+        time_axis, envelope = compute_waveform_envelope(self.audio_data, self.sample_rate, width_px)
+
+        self._envelope = (self.audio_data, time_axis, envelope)
+        return time_axis, envelope
+
     def set_split_points(self, split_points):
         """设置分割点并重新绘制"""
         self.split_points = split_points
@@ -600,19 +956,19 @@ class WaveformViewer:
 
         # 查找最近的分割点
         if self.split_points:
-            distances = [abs(point - click_time) for point in self.split_points]
-            min_distance = min(distances)
+            distances = np.abs(np.asarray(self.split_points) - click_time)
+            nearest_index = int(np.argmin(distances))
 
             # 如果点击距离分割点很近（0.2秒内），选中该点
-            if min_distance < 0.2:
-                self.selected_point_index = distances.index(min_distance)
+            if distances[nearest_index] < 0.2:
+                self.selected_point_index = nearest_index
                 self.dragging = True
-                self.draw_waveform()
+                self.update_split_lines()
                 return
 
         # 如果没有点击分割点，取消选择
         self.selected_point_index = None
-        self.draw_waveform()
+        self.update_split_lines()
 
     def on_mouse_release(self, event):
         """鼠标释放事件"""
@@ -627,7 +983,7 @@ class WaveformViewer:
         new_time = event.xdata
         if new_time is not None and 0 <= new_time <= len(self.audio_data) / self.sample_rate:
             self.split_points[self.selected_point_index] = new_time
-            self.draw_waveform()
+            self.update_split_lines()
 
     def add_split_point(self):
         """添加分割点"""
@@ -677,13 +1033,28 @@ class AudioSplitterGUI:
         except:
             pass
         
-        self.splitter = AudioSplitter()
+        # GUI跨运行复用视频时长缓存
+        self.splitter = AudioSplitter(video_cache_file=DURATION_CACHE_FILE)
         self.selected_file = ""
         self.is_splitting = False
-        self.video_files = []  # 视频文件列表
-        self.video_durations = []  # 视频时长列表
+        self.video_rows = np.empty(0, dtype=VIDEO_ROW_DTYPE)  # 视频列表（路径和时长存在同一个结构化数组中）
         
         self.setup_ui()
+
+        # 在后台预热解码和分析所需的组件，用户选择第一个文件时不必再等待
+        thread = threading.Thread(target=self._warm_decoders)
+        thread.daemon = True
+        thread.start()
+
+    @staticmethod
+    def _warm_decoders():
+        """后台线程：预先加载libsndfile的格式表并编译numba RMS内核"""
+        try:
+            sf.available_formats()
+            get_rolling_mean_square_kernel()
+        except Exception:
+            # 预热失败不影响使用，首次加载时会再次尝试
+            pass
         
     def setup_ui(self):
         """设置用户界面"""
@@ -937,7 +1308,8 @@ class AudioSplitterGUI:
         self.waveform_info_label.grid(row=0, column=0, sticky=tk.W, pady=(0, 10))
 
         # 波形图区域
-        self.figure = plt.Figure(figsize=(10, 6), dpi=80)
+        self.figure = plt.Figure(figsize=(10, 6), dpi=72)
+        self.figure.subplots_adjust(**WAVEFORM_LAYOUT)
         self.canvas = FigureCanvasTkAgg(self.figure, waveform_panel)
         self.canvas.get_tk_widget().grid(row=1, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
@@ -947,12 +1319,22 @@ class AudioSplitterGUI:
 
         # 绑定鼠标事件
         self.canvas.mpl_connect('button_press_event', self.on_waveform_click)
+        self.canvas.mpl_connect('draw_event', self.on_draw)
 
         # 初始化波形相关变量
         self.audio_data = None
         self.sample_rate = None
         self.split_points = []
         self.selected_point_index = None
+        self._waveform_axes = None  # 当前波形图的两个子图 (波形, 音量)，空白图时为None
+        self._waveform_audio = None  # 当前波形图对应的音频数据
+        self._background = None  # 不含分割线的画布背景，用于快速重绘分割线
+        self._split_artists = []  # 每个分割点在两个子图中的竖线 [(ax1线, ax2线), ...]
+        self._total_duration = None  # 已加载音频的总时长（秒），供自定义长度预览使用
+        self._envelope = None  # 波形显示包络缓存 (音频数据, 时间轴, 包络)
+        self._volume_analysis = None  # 音量分析缓存 (音频数据, 时间轴, RMS音量, 静音区域)
+        self._preview_after_id = None  # 等待执行的自定义长度预览更新
+        self._last_ui_flush = 0.0  # 上次刷新进度显示的时间（time.monotonic）
 
         # 初始化界面状态
         self.on_mode_change()
@@ -976,9 +1358,7 @@ class AudioSplitterGUI:
             self.selected_file = filename
             self.file_path_var.set(filename)
             self.status_var.set(f"✅ 已选择文件: {os.path.basename(filename)}")
-            # 更新自定义长度预览
-            self.update_custom_preview()
-            # 加载并显示波形
+            # 加载并显示波形（加载完成后更新自定义长度预览和分割点）
             self.load_and_display_waveform()
     
     def get_duration_in_seconds(self):
@@ -1016,7 +1396,14 @@ class AudioSplitterGUI:
         self.update_waveform_split_points()
 
     def on_custom_input_change(self, event=None):
-        """自定义长度输入变化事件处理"""
+        """自定义长度输入变化事件处理（连续输入时合并为一次更新）"""
+        if self._preview_after_id is not None:
+            self.root.after_cancel(self._preview_after_id)
+        self._preview_after_id = self.root.after(PREVIEW_DEBOUNCE_MS, self._do_preview_update)
+
+    def _do_preview_update(self):
+        """输入停顿后更新自定义长度预览和波形分割点"""
+        self._preview_after_id = None
         self.update_custom_preview()
         # 更新波形分割点
         self.update_waveform_split_points()
@@ -1027,26 +1414,29 @@ class AudioSplitterGUI:
             return None, "请输入自定义长度"
 
         try:
-            # 分割字符串并转换为数字
+            # 分割字符串
             parts = [part.strip() for part in input_str.split(',')]
-            durations = []
+
+            # 整个输入都是合法数值时一次性转换和检查，否则逐个检查以给出具体的错误位置
+            if DURATION_LIST_PATTERN.fullmatch(input_str):
+                durations = np.fromiter(map(float, parts), dtype=np.float64, count=len(parts))
+                non_positive = np.flatnonzero(durations <= 0)
+                if non_positive.size:
+                    return None, f"第{non_positive[0]+1}个长度必须大于0"
+                return durations.tolist(), None
 
             for i, part in enumerate(parts):
                 if not part:
                     return None, f"第{i+1}个长度不能为空"
 
-                try:
-                    duration = float(part)
-                    if duration <= 0:
-                        return None, f"第{i+1}个长度必须大于0"
-                    durations.append(duration)
-                except ValueError:
+                if not DURATION_PATTERN.fullmatch(part):
                     return None, f"第{i+1}个长度格式错误: {part}"
 
-            if len(durations) == 0:
-                return None, "至少需要输入一个长度"
+                if float(part) <= 0:
+                    return None, f"第{i+1}个长度必须大于0"
 
-            return durations, None
+            # 整体不匹配时上面的逐个检查一定能找到出错的数值，走到这里说明两个正则表达式不一致
+            raise ValueError(f"无法识别的长度列表: {input_str}")
 
         except Exception as e:
             return None, f"解析错误: {str(e)}"
@@ -1071,35 +1461,32 @@ class AudioSplitterGUI:
 
     def add_video_files(self, file_paths):
         """添加视频文件到列表"""
-        # 验证文件
-        valid_files, invalid_files, error_messages = self.splitter.video_processor.validate_video_files(file_paths)
-
-        if invalid_files:
-            error_msg = "以下文件无法添加:\n" + "\n".join(error_messages)
-            messagebox.showwarning("文件验证", error_msg)
-
-        if valid_files:
-            # 读取视频时长
-            self.read_video_durations(valid_files)
+        # 读取时长的同时完成验证（能读取到时长即为有效文件），每个文件只打开一次
+        self.read_video_durations(file_paths)
 
     def read_video_durations(self, file_paths):
-        """读取视频文件时长"""
+        """读取视频文件时长，无法读取的文件汇总提示"""
         def progress_callback(progress, message):
             # 这里可以添加进度显示
             pass
 
         try:
-            # 批量读取视频时长
+            # 批量读取视频时长（内部用线程池并行读取，结果保持输入顺序）
             results = self.splitter.video_processor.batch_get_video_durations(file_paths, progress_callback)
 
+            error_messages = [result['error'] for result in results if not result['success']]
+            if error_messages:
+                error_msg = "以下文件无法添加:\n" + "\n".join(error_messages)
+                messagebox.showwarning("文件验证", error_msg)
+
             # 添加到列表
-            for result in results:
-                if result['success']:
-                    self.video_files.append(result['file_path'])
-                    self.video_durations.append(result['duration'])
+            first_new_index = len(self.video_rows)
+            new_rows = np.array([(result['file_path'], result['duration']) for result in results if result['success']],
+                                dtype=VIDEO_ROW_DTYPE)
+            self.video_rows = np.concatenate((self.video_rows, new_rows))
 
-            # 更新界面显示
-            self.update_video_list_display()
+            # 更新界面显示（只插入新增的行）
+            self.append_video_rows(first_new_index)
             self.update_video_info()
 
             if len(results) > 0:
@@ -1109,35 +1496,37 @@ class AudioSplitterGUI:
         except Exception as e:
             messagebox.showerror("错误", f"读取视频时长时发生错误: {str(e)}")
 
-    def update_video_list_display(self):
-        """更新视频列表显示"""
-        # 清空现有项目
-        for item in self.video_tree.get_children():
-            self.video_tree.delete(item)
+    def append_video_rows(self, start):
+        """在视频列表末尾插入从start开始的视频"""
+        # 先格式化好所有行，插入循环中只有Tk调用（Treeview的重绘在空闲时合并进行）
+        rows = [(i+1, os.path.basename(file_path), f"{duration:.3f}")
+                for i, (file_path, duration) in enumerate(self.video_rows[start:].tolist(), start)]
+        for values in rows:
+            self.video_tree.insert('', 'end', values=values)
 
-        # 添加视频文件信息
-        for i, (file_path, duration) in enumerate(zip(self.video_files, self.video_durations)):
-            file_name = os.path.basename(file_path)
-            duration_str = f"{duration:.3f}"
-            self.video_tree.insert('', 'end', values=(i+1, file_name, duration_str))
+    def renumber_video_rows(self, start, stop=None):
+        """更新视频列表中第start到stop-1行的序号"""
+        items = self.video_tree.get_children()
+        for i in range(start, len(items) if stop is None else stop):
+            self.video_tree.set(items[i], '序号', i+1)
 
     def update_video_info(self):
         """更新视频匹配信息"""
-        if not self.video_files:
+        if not len(self.video_rows):
             self.video_info_label.config(text="📹 请选择视频文件", foreground="#95A5A6")
             return
 
-        total_duration = sum(self.video_durations)
-        file_count = len(self.video_files)
+        total_duration = self.video_rows['duration'].sum()
+        file_count = len(self.video_rows)
 
         info_text = f"📹 共 {file_count} 个视频文件，总时长: {total_duration:.3f}秒"
         self.video_info_label.config(text=info_text, foreground="#2E86AB")
 
     def clear_video_files(self):
         """清空视频文件列表"""
-        self.video_files.clear()
-        self.video_durations.clear()
-        self.update_video_list_display()
+        self.video_rows = np.empty(0, dtype=VIDEO_ROW_DTYPE)
+        # 一次调用删除全部行
+        self.video_tree.delete(*self.video_tree.get_children())
         self.update_video_info()
         self.update_waveform_split_points()
 
@@ -1152,15 +1541,11 @@ class AudioSplitterGUI:
 
         if index > 0:
             # 交换列表中的位置
-            self.video_files[index], self.video_files[index-1] = self.video_files[index-1], self.video_files[index]
-            self.video_durations[index], self.video_durations[index-1] = self.video_durations[index-1], self.video_durations[index]
-
-            # 更新显示
-            self.update_video_list_display()
+            self.video_rows[[index-1, index]] = self.video_rows[[index, index-1]]
 
-            # 重新选中移动后的项目
-            new_item = self.video_tree.get_children()[index-1]
-            self.video_tree.selection_set(new_item)
+            # 更新显示：只移动选中行并更新交换的两行序号，选中状态保持不变
+            self.video_tree.move(item, '', index-1)
+            self.renumber_video_rows(index-1, index+1)
 
             # 更新分割点
             self.update_waveform_split_points()
@@ -1174,17 +1559,13 @@ class AudioSplitterGUI:
         item = selection[0]
         index = self.video_tree.index(item)
 
-        if index < len(self.video_files) - 1:
+        if index < len(self.video_rows) - 1:
             # 交换列表中的位置
-            self.video_files[index], self.video_files[index+1] = self.video_files[index+1], self.video_files[index]
-            self.video_durations[index], self.video_durations[index+1] = self.video_durations[index+1], self.video_durations[index]
+            self.video_rows[[index, index+1]] = self.video_rows[[index+1, index]]
 
-            # 更新显示
-            self.update_video_list_display()
-
-            # 重新选中移动后的项目
-            new_item = self.video_tree.get_children()[index+1]
-            self.video_tree.selection_set(new_item)
+            # 更新显示：只移动选中行并更新交换的两行序号，选中状态保持不变
+            self.video_tree.move(item, '', index+1)
+            self.renumber_video_rows(index, index+2)
 
             # 更新分割点
             self.update_waveform_split_points()
@@ -1199,11 +1580,11 @@ class AudioSplitterGUI:
         index = self.video_tree.index(item)
 
         # 从列表中删除
-        del self.video_files[index]
-        del self.video_durations[index]
+        self.video_rows = np.delete(self.video_rows, index)
 
-        # 更新显示
-        self.update_video_list_display()
+        # 更新显示：只删除该行并更新其后各行的序号
+        self.video_tree.delete(item)
+        self.renumber_video_rows(index)
         self.update_video_info()
         self.update_waveform_split_points()
 
@@ -1226,35 +1607,25 @@ class AudioSplitterGUI:
         # 计算总时长
         total_specified = sum(durations)
 
-        # 如果有选择的文件，计算最后一段长度
-        if self.selected_file:
-            try:
-                # 这里简化处理，实际应用中可能需要缓存音频时长
-                import librosa
-                audio_data, sample_rate = librosa.load(self.selected_file, sr=None)
-                total_duration = len(audio_data) / sample_rate
-
-                last_segment = total_duration - total_specified
-
-                if total_specified >= total_duration:
-                    self.preview_label.config(
-                        text=f"❌ 指定总时长({total_specified:.1f}秒)超出音频时长({total_duration:.1f}秒)",
-                        foreground="#E74C3C"
-                    )
-                elif last_segment < 1.0:
-                    self.preview_label.config(
-                        text=f"⚠️ 将生成{len(durations)}段，最后一段({last_segment:.1f}秒)将被跳过",
-                        foreground="#F39C12"
-                    )
-                else:
-                    self.preview_label.config(
-                        text=f"✅ 将生成{len(durations)+1}段，最后一段{last_segment:.1f}秒",
-                        foreground="#27AE60"
-                    )
-            except:
+        # 如果已加载音频，使用加载时记录的时长计算最后一段长度，不重新解码文件
+        if self._total_duration is not None:
+            total_duration = self._total_duration
+            last_segment = total_duration - total_specified
+
+            if total_specified >= total_duration:
+                self.preview_label.config(
+                    text=f"❌ 指定总时长({total_specified:.1f}秒)超出音频时长({total_duration:.1f}秒)",
+                    foreground="#E74C3C"
+                )
+            elif last_segment < 1.0:
+                self.preview_label.config(
+                    text=f"⚠️ 将生成{len(durations)}段，最后一段({last_segment:.1f}秒)将被跳过",
+                    foreground="#F39C12"
+                )
+            else:
                 self.preview_label.config(
-                    text=f"ℹ️ 指定{len(durations)}段，总时长{total_specified:.1f}秒",
-                    foreground="#2E86AB"
+                    text=f"✅ 将生成{len(durations)+1}段，最后一段{last_segment:.1f}秒",
+                    foreground="#27AE60"
                 )
         else:
             self.preview_label.config(
@@ -1279,6 +1650,9 @@ class AudioSplitterGUI:
     def draw_empty_waveform(self):
         """绘制空的波形图"""
         self.figure.clear()
+        self._waveform_axes = None
+        self._waveform_audio = None
+        self._split_artists = []
         ax = self.figure.add_subplot(1, 1, 1)
         ax.text(0.5, 0.5, '请选择音频文件以显示波形',
                 horizontalalignment='center', verticalalignment='center',
@@ -1289,26 +1663,63 @@ class AudioSplitterGUI:
         self.canvas.draw()
 
     def load_and_display_waveform(self):
-        """加载并显示音频波形"""
+        """在后台线程加载音频，完成后回到主线程显示波形，加载期间界面保持响应"""
         if not self.selected_file:
             return
 
-        try:
-            # 加载音频文件
-            self.audio_data, self.sample_rate = librosa.load(self.selected_file, sr=None)
-            total_duration = len(self.audio_data) / self.sample_rate
+        self.waveform_info_var.set(f"正在加载: {os.path.basename(self.selected_file)}...")
+        self.refresh_waveform_button.config(state="disabled")
 
-            # 更新信息
-            info_text = f"文件: {os.path.basename(self.selected_file)} | "
-            info_text += f"时长: {total_duration:.1f}秒 | 采样率: {self.sample_rate}Hz"
-            self.waveform_info_var.set(info_text)
+        thread = threading.Thread(target=self._load_audio_worker, args=(self.selected_file,))
+        thread.daemon = True
+        thread.start()
 
-            # 绘制波形
-            self.draw_waveform()
+    def _load_audio_worker(self, file_path):
+        """后台线程：解码音频并预先完成音量分析"""
+        try:
+            # 加载音频文件（soundfile解码为float32，无法解码时回退到librosa），
+            # 解码结果由分割器缓存，之后分割同一文件时不再重新解码
+            audio_data, sample_rate = self.splitter.load_audio_cached(file_path)
+
+            # 预先计算音量曲线和静音区域，绘图时直接复用
+            time_points, rms_values = self.splitter.analyze_audio_volume(audio_data, sample_rate)
+            silence_regions = self.splitter.find_silence_regions(audio_data, sample_rate)
+            volume_analysis = (audio_data, time_points, rms_values, silence_regions)
 
+            self.root.after(0, self._on_audio_loaded, file_path, audio_data, sample_rate, volume_analysis, None)
         except Exception as e:
-            self.waveform_info_var.set(f"加载失败: {str(e)}")
+            self.root.after(0, self._on_audio_loaded, file_path, None, None, None, str(e))
+
+    def _on_audio_loaded(self, file_path, audio_data, sample_rate, volume_analysis, error):
+        """主线程：保存加载结果并绘制波形"""
+        # 加载期间用户又选择了其他文件，丢弃过期的结果
+        if file_path != self.selected_file:
+            return
+
+        self.refresh_waveform_button.config(state="normal")
+
+        if error is not None:
+            self.audio_data = None
+            self._total_duration = None
+            self.waveform_info_var.set(f"加载失败: {error}")
             self.draw_empty_waveform()
+            self.update_custom_preview()
+            return
+
+        self.audio_data, self.sample_rate = audio_data, sample_rate
+        self._volume_analysis = volume_analysis
+        total_duration = len(self.audio_data) / self.sample_rate
+        self._total_duration = total_duration
+
+        # 更新信息
+        info_text = f"文件: {os.path.basename(file_path)} | "
+        info_text += f"时长: {total_duration:.1f}秒 | 采样率: {self.sample_rate}Hz"
+        self.waveform_info_var.set(info_text)
+
+        # 绘制波形，并按当前设置更新自定义长度预览和分割点
+        self.draw_waveform()
+        self.update_custom_preview()
+        self.update_waveform_split_points()
 
     def draw_waveform(self):
         """绘制音频波形"""
@@ -1323,19 +1734,17 @@ class AudioSplitterGUI:
         ax1 = self.figure.add_subplot(2, 1, 1)
         ax2 = self.figure.add_subplot(2, 1, 2)
 
-        # 时间轴
-        time_axis = np.linspace(0, len(self.audio_data) / self.sample_rate, len(self.audio_data))
-
-        # 绘制波形（采样显示以提高性能）
-        step = max(1, len(self.audio_data) // 10000)  # 最多显示10000个点
-        ax1.plot(time_axis[::step], self.audio_data[::step], color='#2E86AB', alpha=0.8, linewidth=0.6)
+        # 绘制波形（按屏幕分辨率降采样的包络）
+        time_axis, envelope = self.get_waveform_envelope()
+        # 包络每个像素列约有四个点，抗锯齿看不出差别，关闭后光栅化更快
+        ax1.plot(time_axis, envelope, color='#2E86AB', alpha=0.8, linewidth=0.6, antialiased=False)
         ax1.set_title('🎵 音频波形', fontsize=12, fontweight='bold', color='#2E86AB')
         ax1.set_ylabel('振幅', fontsize=10)
         ax1.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
         ax1.set_facecolor('#F8F9FA')
 
         # 分析音量并绘制
-        time_points, rms_values = self.splitter.analyze_audio_volume(self.audio_data, self.sample_rate)
+        time_points, rms_values, silence_regions = self.get_volume_analysis()
         ax2.plot(time_points, rms_values, color='#E74C3C', linewidth=2.5, label='RMS音量', alpha=0.9)
         ax2.set_title('📊 音量变化', fontsize=12, fontweight='bold', color='#E74C3C')
         ax2.set_xlabel('时间 (秒)', fontsize=10)
@@ -1344,33 +1753,121 @@ class AudioSplitterGUI:
         ax2.set_facecolor('#F8F9FA')
         ax2.legend(loc='upper right')
 
-        # 检测并标记静音区域
-        silence_regions = self.splitter.find_silence_regions(self.audio_data, self.sample_rate)
+        # 标记静音区域
         for start, end in silence_regions:
             ax1.axvspan(start, end, alpha=0.2, color='#F39C12', label='🔇 静音区域' if start == silence_regions[0][0] else '')
             ax2.axvspan(start, end, alpha=0.2, color='#F39C12')
 
         # 标记分割点
-        self.draw_split_points(ax1, ax2)
+        # 分割线设为animated，不画进背景，分割点变化时只重绘分割线
+        self._waveform_axes = (ax1, ax2)
+        self._waveform_audio = self.audio_data
+        self._split_artists = []
+        self._sync_split_lines()
+        self._style_split_lines()
+
+        # 整图重绘交给draw_idle合并，重绘完成后on_draw保存新背景
+        self._background = None
+        self.canvas.draw_idle()
+
+    def get_volume_analysis(self):
+        """
+        获取音量曲线和静音区域
 
-        # 调整布局
-        self.figure.tight_layout()
-        self.canvas.draw()
+        结果按音频数据缓存（加载时已在后台线程算好），重绘时不再分析整段音频
 
-    def draw_split_points(self, ax1, ax2):
-        """在波形图上绘制分割点"""
-        if not self.split_points:
-            return
+        Returns:
+            tuple: (时间轴, RMS音量数组, 静音区域列表)
+        """
+        if self._volume_analysis is not None and self._volume_analysis[0] is self.audio_data:
+            return self._volume_analysis[1:]
 
-        for i, point in enumerate(self.split_points):
+        time_points, rms_values = self.splitter.analyze_audio_volume(self.audio_data, self.sample_rate)
+        silence_regions = self.splitter.find_silence_regions(self.audio_data, self.sample_rate)
+
+        self._volume_analysis = (self.audio_data, time_points, rms_values, silence_regions)
+        return time_points, rms_values, silence_regions
+
+    def get_waveform_envelope(self):
+        """
+        获取用于显示的波形包络
+
+        包络按音频数据缓存，切换模式或调整分割点重绘时直接复用
+
+        Returns:
+            tuple: (时间轴, 包络数据)
+        """
+        if self._envelope is not None and self._envelope[0] is self.audio_data:
+            return self._envelope[1], self._envelope[2]
+
+        width_px = int(self.figure.get_figwidth() * self.figure.dpi)
+        time_axis, envelope = compute_waveform_envelope(self.audio_data, self.sample_rate, width_px)
+
+        self._envelope = (self.audio_data, time_axis, envelope)
+        return time_axis, envelope
+
+    def _sync_split_lines(self):
+        """使分割线数量与分割点数量一致，只增加缺少的竖线、删除多余的竖线"""
+        while len(self._split_artists) > len(self.split_points):
+            for line in self._split_artists.pop():
+                line.remove()
+
+        ax1, ax2 = self._waveform_axes
+        for point in self.split_points[len(self._split_artists):]:
+            self._split_artists.append((ax1.axvline(x=point, linestyle='--', animated=True),
+                                        ax2.axvline(x=point, linestyle='--', animated=True)))
+
+    def _style_split_lines(self):
+        """按当前分割点位置和选中状态设置分割线"""
+        for i, (point, lines) in enumerate(zip(self.split_points, self._split_artists)):
             # 选中的点用红色，其他用绿色
             color = '#E74C3C' if i == self.selected_point_index else '#27AE60'
             linewidth = 3.5 if i == self.selected_point_index else 2.5
             alpha = 0.9 if i == self.selected_point_index else 0.7
 
-            ax1.axvline(x=point, color=color, linestyle='--', alpha=alpha, linewidth=linewidth,
-                       label=f'✂️ 分割点' if i == 0 else '')
-            ax2.axvline(x=point, color=color, linestyle='--', alpha=alpha, linewidth=linewidth)
+            for line in lines:
+                line.set_xdata([point, point])
+                line.set_color(color)
+                line.set_linewidth(linewidth)
+                line.set_alpha(alpha)
+
+    def _draw_split_lines(self):
+        """在画布上绘制分割线"""
+        for lines in self._split_artists:
+            for line in lines:
+                self.figure.draw_artist(line)
+
+    def on_draw(self, event):
+        """画布完整重绘后（包括窗口缩放）保存背景并画出分割线"""
+        if self._waveform_axes is None:
+            self._background = None
+            return
+
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_split_lines()
+
+    def update_split_lines(self):
+        """
+        只重绘分割线
+
+        复用已有的竖线，只更新位置和样式；恢复保存的背景后重画分割线并blit，
+        不重新绘制波形、音量和静音区域。波形尚未按当前音频绘制时回退到完整重绘
+        """
+        if self._waveform_axes is None or self._waveform_audio is not self.audio_data:
+            self.draw_waveform()
+            return
+
+        self._sync_split_lines()
+        self._style_split_lines()
+
+        if self._background is None:
+            # 整图重绘尚未完成，重绘后on_draw会画出分割线
+            self.canvas.draw_idle()
+            return
+
+        self.canvas.restore_region(self._background)
+        self._draw_split_lines()
+        self.canvas.blit(self.figure.bbox)
 
     def update_waveform_split_points(self):
         """根据当前设置更新波形上的分割点"""
@@ -1403,62 +1900,60 @@ class AudioSplitterGUI:
                             self.split_points.append(optimal_time)
                             current_position = optimal_time
                     else:
-                        # 高精度固定分割点
-                        for i in range(1, num_segments):
-                            target_time = current_position + duration
-                            # 使用round()确保精确对齐到采样点
-                            target_sample = round(target_time * self.sample_rate)
-                            precise_time = target_sample / self.sample_rate
-                            self.split_points.append(min(precise_time, total_duration))
-                            current_position = precise_time
+                        # 高精度固定分割点：与split_audio相同，第i个分割点取 i * 分割时长，
+                        # 四舍五入对齐到采样点边界
+                        target_samples = np.round(np.arange(1, num_segments) * (duration * self.sample_rate))
+                        precise_times = np.minimum(target_samples / self.sample_rate, total_duration)
+                        self.split_points = [0] + precise_times.tolist()
 
             elif mode == "custom":
                 durations, error = self.parse_custom_durations(self.custom_durations_var.get())
                 if durations and not error:
                     # 计算自定义长度分割点
-                    current_position = 0
-                    self.split_points.append(current_position)
-
-                    for duration in durations:
-                        target_time = current_position + duration
-                        if smart_split:
-                            optimal_time = self.splitter.find_optimal_split_point(
-                                self.audio_data, self.sample_rate, target_time, search_range)
-                            self.split_points.append(optimal_time)
-                            current_position = optimal_time
-                        else:
-                            # 高精度固定分割：确保分割点对齐到采样点边界
-                            target_sample = round(target_time * self.sample_rate)
-                            precise_time = target_sample / self.sample_rate
-                            self.split_points.append(precise_time)
-                            current_position = precise_time
+                    self.split_points = self._accumulated_split_points(durations, smart_split, search_range)
 
             elif mode == "video":
-                if self.video_durations:
+                if len(self.video_rows):
                     # 计算视频时长匹配分割点
-                    current_position = 0
-                    self.split_points.append(current_position)
+                    self.split_points = self._accumulated_split_points(self.video_rows['duration'], smart_split, search_range)
 
-                    for duration in self.video_durations:
-                        target_time = current_position + duration
-                        if smart_split:
-                            optimal_time = self.splitter.find_optimal_split_point(
-                                self.audio_data, self.sample_rate, target_time, search_range)
-                            self.split_points.append(optimal_time)
-                            current_position = optimal_time
-                        else:
-                            # 高精度固定分割：确保分割点对齐到采样点边界
-                            target_sample = round(target_time * self.sample_rate)
-                            precise_time = target_sample / self.sample_rate
-                            self.split_points.append(precise_time)
-                            current_position = precise_time
-
-            # 重新绘制波形
-            self.draw_waveform()
+            # 只重绘分割线
+            self.update_split_lines()
 
         except Exception as e:
             print(f"更新分割点时发生错误: {e}")
 
+    def _accumulated_split_points(self, durations, smart_split, search_range):
+        """
+        按各段长度依次计算分割点（自定义长度和视频时长匹配模式）
+
+        Args:
+            durations (list): 各段长度（秒）
+            smart_split (bool): 是否启用智能分割
+            search_range (float): 智能分割搜索范围（秒）
+
+        Returns:
+            list: 分割点列表（秒），以0开始
+        """
+        if not smart_split:
+            # 高精度固定分割：每段长度四舍五入为整数个采样点后累加，
+            # 与split_audio逐段对齐到采样点边界的结果相同
+            segment_samples = np.round(np.asarray(durations, dtype=np.float64) * self.sample_rate)
+            return [0] + (np.cumsum(segment_samples) / self.sample_rate).tolist()
+
+        # 智能分割：每个目标点取决于上一个实际分割点，需要逐个寻找
+        split_points = [0]
+        current_position = 0
+
+        for duration in durations:
+            target_time = current_position + duration
+            optimal_time = self.splitter.find_optimal_split_point(
+                self.audio_data, self.sample_rate, target_time, search_range)
+            split_points.append(optimal_time)
+            current_position = optimal_time
+
+        return split_points
+
     def on_waveform_click(self, event):
         """波形图点击事件"""
         if event.inaxes is None or self.audio_data is None:
@@ -1468,36 +1963,43 @@ class AudioSplitterGUI:
         if click_time is None:
             return
 
+        previous_index = self.selected_point_index
+
+        # 如果没有点击分割点，取消选择
+        self.selected_point_index = None
+
         # 查找最近的分割点
         if self.split_points:
-            distances = [abs(point - click_time) for point in self.split_points]
-            min_distance = min(distances)
+            distances = np.abs(np.asarray(self.split_points) - click_time)
+            nearest_index = int(np.argmin(distances))
 
             # 如果点击距离分割点很近（0.3秒内），选中该点
-            if min_distance < 0.3:
-                self.selected_point_index = distances.index(min_distance)
-                self.draw_waveform()
-                return
+            if distances[nearest_index] < 0.3:
+                self.selected_point_index = nearest_index
 
-        # 如果没有点击分割点，取消选择
-        self.selected_point_index = None
-        self.draw_waveform()
+        # 选中状态没有变化时不需要重绘，变化时只重绘分割线
+        if self.selected_point_index != previous_index:
+            self.update_split_lines()
 
     def refresh_waveform(self):
         """刷新波形显示"""
         if self.selected_file:
+            # 加载完成后会重新计算分割点
             self.load_and_display_waveform()
-            self.update_waveform_split_points()
         else:
             self.draw_empty_waveform()
 
 
     
     def update_progress(self, progress, message):
-        """更新进度显示"""
+        """更新进度显示（界面刷新至少间隔PROGRESS_FLUSH_INTERVAL，完成时总是刷新）"""
         self.progress_var.set(progress)
         self.status_var.set(message)
-        self.root.update_idletasks()
+
+        now = time.monotonic()
+        if progress >= 100 or now - self._last_ui_flush >= PROGRESS_FLUSH_INTERVAL:
+            self.root.update_idletasks()
+            self._last_ui_flush = now
     
     def start_splitting(self):
         """开始分割音频"""
@@ -1551,7 +2053,7 @@ class AudioSplitterGUI:
 
         elif mode == "video":
             # 视频时长匹配模式
-            if not self.video_durations:
+            if not len(self.video_rows):
                 messagebox.showerror("错误", "请先选择视频文件")
                 return
 
@@ -1560,7 +2062,7 @@ class AudioSplitterGUI:
             self.split_button.config(state="disabled")
 
             # 在新线程中执行分割操作
-            thread = threading.Thread(target=self.split_audio_thread, args=(None, self.video_durations, smart_split, search_range))
+            thread = threading.Thread(target=self.split_audio_thread, args=(None, self.video_rows['duration'].tolist(), smart_split, search_range))
             thread.daemon = True
             thread.start()
     
@@ -5,8 +5,9 @@
 """
 
 import os
+import shutil
 import sys
-import numpy as np
+import tempfile
 import soundfile as sf
 
 # 添加当前目录到Python路径
@@ -20,6 +21,7 @@ def test_basic_functionality():
         # 测试导入
         from video_processor import VideoProcessor
         from main import AudioSplitter
+        from create_test_audio import get_shared_tone
         print("[OK] Imports successful")
         
         # 创建实例
@@ -33,22 +35,20 @@ def test_basic_functionality():
             result = processor.is_supported_format(fmt)
             print(f"  {fmt}: {'supported' if result else 'not supported'}")
         
-        # 创建简单测试音频
+        # 获取共用的简单测试音频（440Hz正弦波，16位WAV）
         duration = 10.0
         sample_rate = 44100
-        t = np.linspace(0, duration, int(duration * sample_rate), False)
-        audio_data = 0.5 * np.sin(2 * np.pi * 440 * t)
-        
-        test_file = "simple_test.wav"
-        sf.write(test_file, audio_data, sample_rate)
+        test_file = get_shared_tone(duration, sample_rate)
         print("[OK] Test audio created")
         
         # 测试视频时长匹配分割
         video_durations = [3.0, 4.0, 2.5]  # 简单的时长列表
         print(f"Testing with durations: {video_durations}")
         
+        # 输出到临时目录（Linux上通常位于内存文件系统），验证后整体删除
+        output_dir = tempfile.mkdtemp(prefix="audio_split_")
         success, message, output_files = splitter.split_audio_by_video_durations(
-            test_file, video_durations, smart_split=False
+            test_file, video_durations, smart_split=False, output_dir=output_dir
         )
         
         if success:
@@ -56,30 +56,25 @@ def test_basic_functionality():
             
             # 验证输出文件
             for i, file_path in enumerate(output_files):
-                if os.path.exists(file_path):
-                    audio_data, sr = sf.read(file_path)
-                    actual_duration = len(audio_data) / sr
-                    expected_duration = video_durations[i] if i < len(video_durations) else 0
-                    error = abs(actual_duration - expected_duration) if expected_duration > 0 else 0
-                    print(f"  File {i+1}: Expected={expected_duration:.3f}s, Actual={actual_duration:.3f}s, Error={error*1000:.1f}ms")
-                    
-                    # 清理文件
-                    os.remove(file_path)
+                # 只读取文件头中的帧数，不解码音频数据；文件不存在或无法读取时跳过
+                try:
+                    info = sf.info(file_path)
+                except RuntimeError:
+                    continue
+                actual_duration = info.frames / info.samplerate
+                expected_duration = video_durations[i] if i < len(video_durations) else 0
+                error = abs(actual_duration - expected_duration) if expected_duration > 0 else 0
+                print(f"  File {i+1}: Expected={expected_duration:.3f}s, Actual={actual_duration:.3f}s, Error={error*1000:.1f}ms")
             
-            # 清理输出目录
-            output_dir = "output"
-            if os.path.exists(output_dir) and not os.listdir(output_dir):
-                os.rmdir(output_dir)
+            # 清理文件：一次删除整个输出目录
+            shutil.rmtree(output_dir, ignore_errors=True)
             
             print("[OK] Video duration matching test passed")
         else:
+            shutil.rmtree(output_dir, ignore_errors=True)
             print(f"[FAIL] Split failed: {message}")
             return False
         
-        # 清理测试文件
-        if os.path.exists(test_file):
-            os.remove(test_file)
-        
         print("\n[SUCCESS] All tests passed!")
         return True
         
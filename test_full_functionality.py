@@ -5,6 +5,7 @@
 """
 
 import os
+import shutil
 import sys
 from pathlib import Path
 
@@ -16,8 +17,9 @@ from create_test_audio import create_test_audio
 
 
 def test_progress_callback(progress, message):
-    """进度回调函数"""
-    print(f"进度: {progress}% - {message}")
+    """进度回调函数（每10%输出一次，减少输出次数）"""
+    if progress % 10 == 0 or progress == 100:
+        sys.stdout.write(f"进度: {progress}% - {message}\n")
 
 
 def test_audio_splitting():
@@ -39,8 +41,9 @@ def test_audio_splitting():
     # 3. 测试音频分割
     print("\n3. 测试音频分割（每2秒分割一次）...")
     success, message, output_files = splitter.split_audio(
-        test_file, 2, test_progress_callback
+        test_file, 2, progress_callback=test_progress_callback
     )
+    sys.stdout.flush()
     
     if success:
         print(f"\n✓ 分割成功: {message}")
@@ -49,17 +52,24 @@ def test_audio_splitting():
         # 检查输出文件
         print("\n输出文件列表:")
         for i, file_path in enumerate(output_files, 1):
-            if os.path.exists(file_path):
+            try:
                 file_size = os.path.getsize(file_path)
-                print(f"  {i}. {os.path.basename(file_path)} ({file_size} 字节)")
-            else:
+            except OSError:
                 print(f"  {i}. {os.path.basename(file_path)} (文件不存在)")
+            else:
+                print(f"  {i}. {os.path.basename(file_path)} ({file_size} 字节)")
         
         # 检查输出目录
         output_dir = Path(test_file).parent / "output"
-        if output_dir.exists():
+        try:
+            # scandir直接读取目录项，不为每个文件创建Path对象
+            with os.scandir(output_dir) as entries:
+                file_count = sum(1 for _ in entries)
+        except OSError:
+            pass
+        else:
             print(f"\n输出目录: {output_dir}")
-            print(f"目录中的文件数量: {len(list(output_dir.glob('*')))}")
+            print(f"目录中的文件数量: {file_count}")
         
         return True
     else:
@@ -92,16 +102,20 @@ def cleanup():
     
     # 删除测试音频文件
     test_file = "test_audio.wav"
-    if os.path.exists(test_file):
+    try:
         os.remove(test_file)
+    except FileNotFoundError:
+        pass
+    else:
         print(f"已删除: {test_file}")
     
     # 删除输出目录
     output_dir = Path("output")
-    if output_dir.exists():
-        for file in output_dir.glob("*"):
-            file.unlink()
-        output_dir.rmdir()
+    try:
+        shutil.rmtree(output_dir)
+    except FileNotFoundError:
+        pass
+    else:
         print(f"已删除输出目录: {output_dir}")
 
 
@@ -6,82 +6,142 @@
 """
 
 import os
+import shutil
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import soundfile as sf
-from pathlib import Path
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from main import AudioSplitter
+from create_test_audio import get_shared_tone
+
+
+CASE_WORKERS = 4  # 并行运行分割用例的线程数
 
 
 def create_test_audio(duration=30.0, sample_rate=44100):
     """创建测试音频文件"""
     print(f"创建测试音频文件 (时长: {duration}秒, 采样率: {sample_rate}Hz)")
     
-    # 生成正弦波
-    t = np.linspace(0, duration, int(duration * sample_rate), False)
-    audio_data = 0.5 * np.sin(2 * np.pi * 440 * t)
+    # 440Hz正弦波16位WAV文件，与其他测试脚本共用，已存在时不再重新生成
+    test_file = get_shared_tone(duration, sample_rate)
     
-    # 保存为WAV文件
-    test_file = "precision_fix_test.wav"
-    sf.write(test_file, audio_data, sample_rate)
+    return test_file, sample_rate
+
+
+def run_fixed_duration_case(splitter, test_file, duration):
+    """
+    运行一个固定时长分割用例
+
+    Returns:
+        list: 该用例的输出行（并行运行时各用例的输出不会交错）
+    """
+    lines = [f"\n测试固定时长: {duration}秒"]
     
-    return test_file, audio_data, sample_rate
+    # 每个用例输出到单独的临时目录（Linux上通常位于内存文件系统），验证后整体删除
+    output_dir = tempfile.mkdtemp(prefix="audio_split_")
+    try:
+        success, message, output_files = splitter.split_audio(
+            test_file, segment_duration=duration, smart_split=False, output_dir=output_dir
+        )
+        
+        if success:
+            lines.append(f"分割成功: {len(output_files)} 个文件")
+            
+            # 验证精确度
+            for i, file_path in enumerate(output_files):
+                # 只读取文件头中的帧数，不解码音频数据；文件不存在或无法读取时跳过
+                try:
+                    info = sf.info(file_path)
+                except RuntimeError:
+                    continue
+                actual_duration = info.frames / info.samplerate
+                
+                if i < len(output_files) - 1:  # 不是最后一个片段
+                    expected_duration = duration
+                    error = abs(actual_duration - expected_duration)
+                    lines.append(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
+                else:  # 最后一个片段
+                    lines.append(f"  片段 {i+1}: 最后片段={actual_duration:.6f}s")
+        else:
+            lines.append(f"分割失败: {message}")
+    finally:
+        # 清理文件：一次删除整个输出目录
+        shutil.rmtree(output_dir, ignore_errors=True)
+    
+    return lines
+
 
+def run_custom_duration_case(splitter, test_file, case_index, custom_durations):
+    """
+    运行一个自定义时长分割用例
 
-def test_fixed_duration_precision():
-    """测试固定时长分割的小数精度"""
+    Returns:
+        list: 该用例的输出行（并行运行时各用例的输出不会交错）
+    """
+    lines = [f"\n测试自定义时长组 {case_index}: {custom_durations}"]
+    
+    # 每个用例输出到单独的临时目录（Linux上通常位于内存文件系统），验证后整体删除
+    output_dir = tempfile.mkdtemp(prefix="audio_split_")
+    try:
+        success, message, output_files = splitter.split_audio(
+            test_file, custom_durations=custom_durations, smart_split=False, output_dir=output_dir
+        )
+        
+        if success:
+            lines.append(f"分割成功: {len(output_files)} 个文件")
+            
+            # 验证精确度
+            for j, file_path in enumerate(output_files[:len(custom_durations)]):
+                # 只读取文件头中的帧数，不解码音频数据；文件不存在或无法读取时跳过
+                try:
+                    info = sf.info(file_path)
+                except RuntimeError:
+                    continue
+                actual_duration = info.frames / info.samplerate
+                expected_duration = custom_durations[j]
+                error = abs(actual_duration - expected_duration)
+                lines.append(f"  片段 {j+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
+        else:
+            lines.append(f"分割失败: {message}")
+    finally:
+        # 清理文件：一次删除整个输出目录
+        shutil.rmtree(output_dir, ignore_errors=True)
+    
+    return lines
+
+
+def test_fixed_duration_precision(test_file=None, splitter=None):
+    """
+    测试固定时长分割的小数精度
+
+    Args:
+        test_file (str, optional): 测试音频文件，未指定时使用共用的测试音频
+        splitter (AudioSplitter, optional): 共用的分割器实例
+    """
     print("\n=== 测试固定时长分割的小数精度 ===")
     
     try:
-        # 创建测试音频
-        test_file, original_audio, sample_rate = create_test_audio()
+        # 获取测试音频（未传入时）
+        if test_file is None:
+            test_file, _ = create_test_audio()
         
-        # 创建分割器
-        splitter = AudioSplitter()
+        # 创建分割器（未传入共用实例时）
+        if splitter is None:
+            splitter = AudioSplitter()
         
         # 测试不同的小数时长
         test_durations = [5.26, 3.75, 7.123, 2.5]
         
-        for duration in test_durations:
-            print(f"\n测试固定时长: {duration}秒")
-            
-            success, message, output_files = splitter.split_audio(
-                test_file, segment_duration=duration, smart_split=False
-            )
-            
-            if success:
-                print(f"分割成功: {len(output_files)} 个文件")
-                
-                # 验证精确度
-                for i, file_path in enumerate(output_files):
-                    if os.path.exists(file_path):
-                        audio_data, sr = sf.read(file_path)
-                        actual_duration = len(audio_data) / sr
-                        
-                        if i < len(output_files) - 1:  # 不是最后一个片段
-                            expected_duration = duration
-                            error = abs(actual_duration - expected_duration)
-                            print(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
-                        else:  # 最后一个片段
-                            print(f"  片段 {i+1}: 最后片段={actual_duration:.6f}s")
-                        
-                        # 清理文件
-                        os.remove(file_path)
-                
-                # 清理输出目录
-                output_dir = Path("output")
-                if output_dir.exists() and not any(output_dir.iterdir()):
-                    output_dir.rmdir()
-            else:
-                print(f"分割失败: {message}")
-        
-        # 清理测试文件
-        if os.path.exists(test_file):
-            os.remove(test_file)
+        # 各用例互不依赖，并行运行（解码和写文件时libsndfile释放GIL），按用例顺序输出
+        with ThreadPoolExecutor(max_workers=min(CASE_WORKERS, len(test_durations))) as executor:
+            for lines in executor.map(lambda duration: run_fixed_duration_case(splitter, test_file, duration),
+                                      test_durations):
+                print("\n".join(lines))
         
         return True
         
@@ -90,16 +150,24 @@ def test_fixed_duration_precision():
         return False
 
 
-def test_custom_duration_precision():
-    """测试自定义时长分割的小数精度"""
+def test_custom_duration_precision(test_file=None, splitter=None):
+    """
+    测试自定义时长分割的小数精度
+
+    Args:
+        test_file (str, optional): 测试音频文件，未指定时使用共用的测试音频
+        splitter (AudioSplitter, optional): 共用的分割器实例
+    """
     print("\n=== 测试自定义时长分割的小数精度 ===")
     
     try:
-        # 创建测试音频
-        test_file, original_audio, sample_rate = create_test_audio()
+        # 获取测试音频（未传入时）
+        if test_file is None:
+            test_file, _ = create_test_audio()
         
-        # 创建分割器
-        splitter = AudioSplitter()
+        # 创建分割器（未传入共用实例时）
+        if splitter is None:
+            splitter = AudioSplitter()
         
         # 测试不同的小数时长组合
         test_cases = [
@@ -108,38 +176,11 @@ def test_custom_duration_precision():
             [6.789, 2.345, 5.678]
         ]
         
-        for i, custom_durations in enumerate(test_cases):
-            print(f"\n测试自定义时长组 {i+1}: {custom_durations}")
-            
-            success, message, output_files = splitter.split_audio(
-                test_file, custom_durations=custom_durations, smart_split=False
-            )
-            
-            if success:
-                print(f"分割成功: {len(output_files)} 个文件")
-                
-                # 验证精确度
-                for j, file_path in enumerate(output_files):
-                    if os.path.exists(file_path) and j < len(custom_durations):
-                        audio_data, sr = sf.read(file_path)
-                        actual_duration = len(audio_data) / sr
-                        expected_duration = custom_durations[j]
-                        error = abs(actual_duration - expected_duration)
-                        print(f"  片段 {j+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
-                        
-                        # 清理文件
-                        os.remove(file_path)
-                
-                # 清理输出目录
-                output_dir = Path("output")
-                if output_dir.exists() and not any(output_dir.iterdir()):
-                    output_dir.rmdir()
-            else:
-                print(f"分割失败: {message}")
-        
-        # 清理测试文件
-        if os.path.exists(test_file):
-            os.remove(test_file)
+        # 各用例互不依赖，并行运行（解码和写文件时libsndfile释放GIL），按用例顺序输出
+        with ThreadPoolExecutor(max_workers=min(CASE_WORKERS, len(test_cases))) as executor:
+            for lines in executor.map(lambda case: run_custom_duration_case(splitter, test_file, *case),
+                                      enumerate(test_cases, 1)):
+                print("\n".join(lines))
         
         return True
         
@@ -148,41 +189,51 @@ def test_custom_duration_precision():
         return False
 
 
+class FakeVar:
+    """代替tk.StringVar的简单变量，测试GUI的解析逻辑时无需创建Tk窗口"""
+    
+    def __init__(self, value=""):
+        self._value = value
+    
+    def get(self):
+        return self._value
+    
+    def set(self, value):
+        self._value = value
+
+
 def test_gui_parameter_passing():
     """测试GUI参数传递的精度"""
-    print("\n=== 测试GUI参数传递精度 ===")
+    # 输出行先收集起来，测试结束时一次输出
+    lines = ["\n=== 测试GUI参数传递精度 ==="]
     
     try:
-        # 创建GUI实例（不显示窗口）
-        import tkinter as tk
+        # 创建GUI实例但不初始化Tk界面：被测的解析方法只用到两个输入变量
         from main import AudioSplitterGUI
         
-        # 创建隐藏的根窗口
-        root = tk.Tk()
-        root.withdraw()  # 隐藏窗口
-        
-        # 创建GUI实例
-        gui = AudioSplitterGUI(root)
+        gui = AudioSplitterGUI.__new__(AudioSplitterGUI)
+        gui.duration_var = FakeVar()
+        gui.time_unit_var = FakeVar("秒")
         
         # 测试固定时长参数传递
-        print("\n测试固定时长参数传递:")
+        lines.append("\n测试固定时长参数传递:")
         test_values = ["5.26", "3.75", "7.123", "2.5"]
         
         for value in test_values:
             gui.duration_var.set(value)
             gui.time_unit_var.set("秒")
             result = gui.get_duration_in_seconds()
-            print(f"  输入: {value}秒 -> 输出: {result}秒")
+            lines.append(f"  输入: {value}秒 -> 输出: {result}秒")
             
             # 验证精度
             expected = float(value)
             if abs(result - expected) < 1e-10:
-                print(f"    ✓ 精度正确")
+                lines.append(f"    ✓ 精度正确")
             else:
-                print(f"    ✗ 精度错误，期望: {expected}, 实际: {result}")
+                lines.append(f"    ✗ 精度错误，期望: {expected}, 实际: {result}")
         
         # 测试自定义时长参数传递
-        print("\n测试自定义时长参数传递:")
+        lines.append("\n测试自定义时长参数传递:")
         test_inputs = [
             "5.26",
             "3.75, 7.123",
@@ -193,34 +244,30 @@ def test_gui_parameter_passing():
         for input_str in test_inputs:
             durations, error = gui.parse_custom_durations(input_str)
             if error:
-                print(f"  输入: {input_str} -> 错误: {error}")
+                lines.append(f"  输入: {input_str} -> 错误: {error}")
             else:
-                print(f"  输入: {input_str} -> 输出: {durations}")
+                lines.append(f"  输入: {input_str} -> 输出: {durations}")
                 
                 # 验证精度
-                expected_values = [float(x.strip()) for x in input_str.split(',')]
+                expected_values = np.fromstring(input_str, sep=',')
                 if len(durations) == len(expected_values):
-                    all_correct = True
-                    for i, (actual, expected) in enumerate(zip(durations, expected_values)):
-                        if abs(actual - expected) >= 1e-10:
-                            all_correct = False
-                            break
+                    all_correct = np.allclose(durations, expected_values, rtol=0, atol=1e-10)
                     
                     if all_correct:
-                        print(f"    ✓ 精度正确")
+                        lines.append(f"    ✓ 精度正确")
                     else:
-                        print(f"    ✗ 精度错误")
+                        lines.append(f"    ✗ 精度错误")
                 else:
-                    print(f"    ✗ 数量不匹配")
-        
-        # 销毁窗口
-        root.destroy()
+                    lines.append(f"    ✗ 数量不匹配")
         
         return True
         
     except Exception as e:
-        print(f"GUI测试失败: {e}")
+        lines.append(f"GUI测试失败: {e}")
         return False
+    
+    finally:
+        print("\n".join(lines))
 
 
 def main():
@@ -230,12 +277,18 @@ def main():
     
     results = []
     
+    # 两个分割测试共用同一个测试音频文件和分割器
+    test_file, _ = create_test_audio()
+    splitter = AudioSplitter()
+    # 预先解码测试音频，之后各用例的分割都复用缓存的解码结果
+    splitter.load_audio_cached(test_file)
+    
     # 测试1: 固定时长分割精度
-    result1 = test_fixed_duration_precision()
+    result1 = test_fixed_duration_precision(test_file, splitter)
     results.append(("固定时长分割精度", result1))
     
     # 测试2: 自定义时长分割精度
-    result2 = test_custom_duration_precision()
+    result2 = test_custom_duration_precision(test_file, splitter)
     results.append(("自定义时长分割精度", result2))
     
     # 测试3: GUI参数传递精度
@@ -6,17 +6,40 @@
 """
 
 import os
+import shutil
 import sys
+import tempfile
+import wave
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import librosa
 import soundfile as sf
-from pathlib import Path
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from main import AudioSplitter
-from create_test_audio import create_test_audio
+from create_test_audio import get_shared_tone
+
+
+CASE_WORKERS = 4  # 并行运行测试用例的线程数（固定上限，与test_precision_fix一致，不按CPU核数放大）
+
+
+def read_wav_frames(file_path):
+    """
+    只解析WAV文件头，获取采样点数和采样率
+
+    标准库wave模块直接读取RIFF头中的fmt和data块，不经过libsndfile；
+    wave模块不支持的格式（如浮点WAV）回退到sf.info
+
+    Returns:
+        tuple: (采样点数, 采样率)
+    """
+    try:
+        with wave.open(file_path, "rb") as wav_file:
+            return wav_file.getnframes(), wav_file.getframerate()
+    except (EOFError, wave.Error):
+        info = sf.info(file_path)
+        return info.frames, info.samplerate
 
 
 class PrecisionTester:
@@ -30,71 +53,83 @@ class PrecisionTester:
         """创建测试音频文件"""
         print(f"创建测试音频文件 (时长: {duration}秒, 采样率: {sample_rate}Hz)...")
         
-        # 生成测试音频数据（正弦波）
-        t = np.linspace(0, duration, int(duration * sample_rate), False)
-        frequency = 440  # A4音符
-        audio_data = 0.5 * np.sin(2 * np.pi * frequency * t)
+        # 440Hz正弦波16位WAV文件（A4音符），与其他测试脚本共用，已存在时不再重新生成
+        test_file = get_shared_tone(duration, sample_rate)
         
-        # 保存为WAV文件
-        test_file = "precision_test_audio.wav"
-        sf.write(test_file, audio_data, sample_rate)
+        # 以解码后的文件内容作为原始音频，与分割片段按相同的16位量化比较；
+        # 通过分割器解码，解码结果同时进入分割器的缓存，之后各用例分割时不再重新解码
+        audio_data, _ = self.splitter.load_audio_cached(test_file)
         
         return test_file, audio_data, sample_rate
     
-    def measure_split_precision(self, output_files, expected_durations, sample_rate):
-        """测量分割精确度"""
-        actual_durations = []
-        precision_errors = []
+    def measure_split_precision(self, output_files, expected_durations, sample_rate, log):
+        """
+        测量分割精确度（输出行追加到log列表）
+
+        Returns:
+            tuple: (实际时长数组, 误差数组)，文件不存在的片段实际时长为0、误差为inf
+        """
+        num_files = len(output_files)
+        actual_durations = np.zeros(num_files)
+        exists = np.zeros(num_files, dtype=bool)
         
         for i, file_path in enumerate(output_files):
-            if os.path.exists(file_path):
-                # 加载音频文件并测量实际时长
-                audio_data, sr = librosa.load(file_path, sr=None)
-                actual_duration = len(audio_data) / sr
-                actual_durations.append(actual_duration)
-                
-                # 计算精确度误差
-                expected_duration = expected_durations[i] if i < len(expected_durations) else expected_durations[-1]
-                error = abs(actual_duration - expected_duration)
-                precision_errors.append(error)
-                
-                print(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error:.6f}s ({error*1000:.3f}ms)")
+            # 只解析WAV文件头中的帧数测量实际时长，不解码音频数据；
+            # 直接打开文件，文件不存在时打开失败，不需要事先检查
+            try:
+                frames, samplerate = read_wav_frames(file_path)
+            except (OSError, RuntimeError):
+                continue
+            actual_durations[i] = frames / samplerate
+            exists[i] = True
+        
+        # 一次计算所有片段的误差；期望时长不足时按最后一个期望时长计算
+        expected = np.asarray(expected_durations, dtype=np.float64)
+        expected = expected[np.minimum(np.arange(num_files), len(expected) - 1)]
+        precision_errors = np.where(exists, np.abs(actual_durations - expected), np.inf)
+        
+        for i in range(num_files):
+            if exists[i]:
+                log.append(f"  片段 {i+1}: 期望={expected[i]:.6f}s, 实际={actual_durations[i]:.6f}s, "
+                           f"误差={precision_errors[i]:.6f}s ({precision_errors[i]*1000:.3f}ms)")
             else:
-                print(f"  片段 {i+1}: 文件不存在")
-                actual_durations.append(0)
-                precision_errors.append(float('inf'))
+                log.append(f"  片段 {i+1}: 文件不存在")
         
         return actual_durations, precision_errors
     
-    def test_continuity(self, output_files, original_audio, sample_rate):
-        """测试音频连续性"""
-        print("  测试音频连续性...")
+    def test_continuity(self, output_files, original_audio, sample_rate, log):
+        """测试音频连续性（输出行追加到log列表）"""
+        log.append("  测试音频连续性...")
         
-        # 重新拼接分割后的音频
-        reconstructed_audio = []
+        # 重新拼接分割后的音频（先收集各片段数组，最后一次拼接）
+        segments = []
         
         for file_path in output_files:
-            if os.path.exists(file_path):
-                audio_data, sr = librosa.load(file_path, sr=None)
-                reconstructed_audio.extend(audio_data)
+            # 文件不存在或无法读取时跳过
+            try:
+                audio_data, sr = sf.read(file_path, dtype='float32', always_2d=False)
+            except RuntimeError:
+                continue
+            segments.append(audio_data)
         
-        reconstructed_audio = np.array(reconstructed_audio)
+        reconstructed_audio = np.concatenate(segments) if segments else np.empty(0, dtype=np.float32)
         
         # 比较原始音频和重构音频
         min_length = min(len(original_audio), len(reconstructed_audio))
         original_trimmed = original_audio[:min_length]
         reconstructed_trimmed = reconstructed_audio[:min_length]
         
-        # 计算差异
-        difference = np.abs(original_trimmed - reconstructed_trimmed)
-        max_difference = np.max(difference)
-        mean_difference = np.mean(difference)
+        # 计算差异（差值和绝对值在同一个临时数组上原地计算）
+        difference = np.subtract(original_trimmed, reconstructed_trimmed, out=np.empty_like(original_trimmed))
+        np.abs(difference, out=difference)
+        max_difference = float(difference.max()) if min_length else 0.0
+        mean_difference = float(difference.mean()) if min_length else 0.0
         
-        print(f"    原始音频长度: {len(original_audio)} 采样点")
-        print(f"    重构音频长度: {len(reconstructed_audio)} 采样点")
-        print(f"    长度差异: {abs(len(original_audio) - len(reconstructed_audio))} 采样点")
-        print(f"    最大幅度差异: {max_difference:.8f}")
-        print(f"    平均幅度差异: {mean_difference:.8f}")
+        log.append(f"    原始音频长度: {len(original_audio)} 采样点")
+        log.append(f"    重构音频长度: {len(reconstructed_audio)} 采样点")
+        log.append(f"    长度差异: {abs(len(original_audio) - len(reconstructed_audio))} 采样点")
+        log.append(f"    最大幅度差异: {max_difference:.8f}")
+        log.append(f"    平均幅度差异: {mean_difference:.8f}")
         
         # 判断连续性是否良好（允许极小的数值误差）
         length_diff = abs(len(original_audio) - len(reconstructed_audio))
@@ -108,48 +143,56 @@ class PrecisionTester:
         
         test_durations = [3.0, 5.5, 7.25]  # 包含非整数时长
         
-        for duration in test_durations:
-            print(f"\n测试固定时长: {duration}秒")
-            
-            # 非智能分割
-            success, message, output_files = self.splitter.split_audio(
-                test_file, segment_duration=duration, smart_split=False
-            )
-            
-            if success:
-                # 计算期望的分割时长
-                total_duration = len(original_audio) / sample_rate
-                num_segments = int(np.ceil(total_duration / duration))
-                expected_durations = [duration] * (num_segments - 1)
-                last_duration = total_duration - (num_segments - 1) * duration
-                expected_durations.append(last_duration)
-                
-                # 测量精确度
-                actual_durations, errors = self.measure_split_precision(output_files, expected_durations, sample_rate)
-                
-                # 测试连续性
-                is_continuous, length_diff, max_diff = self.test_continuity(output_files, original_audio, sample_rate)
-                
-                # 记录结果
-                max_error_ms = max(errors) * 1000 if errors else float('inf')
-                result = {
-                    'mode': 'fixed',
-                    'duration': duration,
-                    'smart_split': False,
-                    'max_error_ms': max_error_ms,
-                    'is_continuous': is_continuous,
-                    'length_diff': length_diff,
-                    'max_amplitude_diff': max_diff
-                }
-                self.test_results.append(result)
-                
-                print(f"  最大误差: {max_error_ms:.3f}ms")
-                print(f"  连续性: {'通过' if is_continuous else '失败'}")
-                
-                # 清理输出文件
-                self.cleanup_output_files(output_files)
-            else:
-                print(f"  分割失败: {message}")
+        self.run_cases(self.run_fixed_case, test_durations, test_file, original_audio, sample_rate)
+    
+    def run_fixed_case(self, duration, test_file, original_audio, sample_rate):
+        """运行一个固定时长分割用例，返回 (输出行, 结果)"""
+        log = [f"\n测试固定时长: {duration}秒"]
+        
+        # 每个用例输出到单独的临时目录，并行运行时互不影响
+        output_dir = tempfile.mkdtemp(prefix="split_")
+        
+        # 非智能分割
+        success, message, output_files = self.splitter.split_audio(
+            test_file, segment_duration=duration, smart_split=False, output_dir=output_dir
+        )
+        
+        if not success:
+            log.append(f"  分割失败: {message}")
+            self.cleanup_output_files(output_dir)
+            return log, None
+        
+        # 计算期望的分割时长
+        total_duration = len(original_audio) / sample_rate
+        num_segments = int(np.ceil(total_duration / duration))
+        expected_durations = np.full(num_segments, duration)
+        expected_durations[-1] = total_duration - (num_segments - 1) * duration
+        
+        # 测量精确度
+        actual_durations, errors = self.measure_split_precision(output_files, expected_durations, sample_rate, log)
+        
+        # 测试连续性
+        is_continuous, length_diff, max_diff = self.test_continuity(output_files, original_audio, sample_rate, log)
+        
+        # 记录结果
+        max_error_ms = errors.max() * 1000 if len(errors) else float('inf')
+        result = {
+            'mode': 'fixed',
+            'duration': duration,
+            'smart_split': False,
+            'max_error_ms': max_error_ms,
+            'is_continuous': is_continuous,
+            'length_diff': length_diff,
+            'max_amplitude_diff': max_diff
+        }
+        
+        log.append(f"  最大误差: {max_error_ms:.3f}ms")
+        log.append(f"  连续性: {'通过' if is_continuous else '失败'}")
+        
+        # 清理输出文件
+        self.cleanup_output_files(output_dir)
+        
+        return log, result
     
     def test_custom_duration_precision(self, test_file, original_audio, sample_rate):
         """测试自定义时长分割精确度"""
@@ -161,45 +204,55 @@ class PrecisionTester:
             [0.5, 1.5, 2.5, 3.5]   # 半秒时长
         ]
         
-        for i, custom_durations in enumerate(test_cases):
-            print(f"\n测试自定义时长组 {i+1}: {custom_durations}")
-            
-            # 非智能分割
-            success, message, output_files = self.splitter.split_audio(
-                test_file, custom_durations=custom_durations, smart_split=False
-            )
-            
-            if success:
-                # 期望时长就是自定义时长
-                expected_durations = custom_durations.copy()
-                
-                # 测量精确度
-                actual_durations, errors = self.measure_split_precision(output_files, expected_durations, sample_rate)
-                
-                # 测试连续性（只测试指定的片段）
-                specified_files = output_files[:len(custom_durations)]
-                is_continuous, length_diff, max_diff = self.test_continuity(specified_files, original_audio, sample_rate)
-                
-                # 记录结果
-                max_error_ms = max(errors[:len(custom_durations)]) * 1000 if errors else float('inf')
-                result = {
-                    'mode': 'custom',
-                    'durations': custom_durations,
-                    'smart_split': False,
-                    'max_error_ms': max_error_ms,
-                    'is_continuous': is_continuous,
-                    'length_diff': length_diff,
-                    'max_amplitude_diff': max_diff
-                }
-                self.test_results.append(result)
-                
-                print(f"  最大误差: {max_error_ms:.3f}ms")
-                print(f"  连续性: {'通过' if is_continuous else '失败'}")
-                
-                # 清理输出文件
-                self.cleanup_output_files(output_files)
-            else:
-                print(f"  分割失败: {message}")
+        self.run_cases(self.run_custom_case, list(enumerate(test_cases, 1)), test_file, original_audio, sample_rate)
+    
+    def run_custom_case(self, case, test_file, original_audio, sample_rate):
+        """运行一个自定义时长分割用例，case为 (组号, 自定义时长列表)，返回 (输出行, 结果)"""
+        case_index, custom_durations = case
+        log = [f"\n测试自定义时长组 {case_index}: {custom_durations}"]
+        
+        # 每个用例输出到单独的临时目录，并行运行时互不影响
+        output_dir = tempfile.mkdtemp(prefix="split_")
+        
+        # 非智能分割
+        success, message, output_files = self.splitter.split_audio(
+            test_file, custom_durations=custom_durations, smart_split=False, output_dir=output_dir
+        )
+        
+        if not success:
+            log.append(f"  分割失败: {message}")
+            self.cleanup_output_files(output_dir)
+            return log, None
+        
+        # 期望时长就是自定义时长
+        expected_durations = np.array(custom_durations)
+        
+        # 测量精确度
+        actual_durations, errors = self.measure_split_precision(output_files, expected_durations, sample_rate, log)
+        
+        # 测试连续性（只测试指定的片段）
+        specified_files = output_files[:len(custom_durations)]
+        is_continuous, length_diff, max_diff = self.test_continuity(specified_files, original_audio, sample_rate, log)
+        
+        # 记录结果
+        max_error_ms = errors[:len(custom_durations)].max() * 1000 if len(errors) else float('inf')
+        result = {
+            'mode': 'custom',
+            'durations': custom_durations,
+            'smart_split': False,
+            'max_error_ms': max_error_ms,
+            'is_continuous': is_continuous,
+            'length_diff': length_diff,
+            'max_amplitude_diff': max_diff
+        }
+        
+        log.append(f"  最大误差: {max_error_ms:.3f}ms")
+        log.append(f"  连续性: {'通过' if is_continuous else '失败'}")
+        
+        # 清理输出文件
+        self.cleanup_output_files(output_dir)
+        
+        return log, result
     
     def test_smart_split_precision(self, test_file, original_audio, sample_rate):
         """测试智能分割精确度"""
@@ -207,47 +260,63 @@ class PrecisionTester:
         
         test_durations = [4.0, 6.5]  # 智能分割测试时长
         
-        for duration in test_durations:
-            print(f"\n测试智能分割: {duration}秒")
-            
-            # 智能分割
-            success, message, output_files = self.splitter.split_audio(
-                test_file, segment_duration=duration, smart_split=True, search_range=1.0
-            )
-            
-            if success:
-                # 对于智能分割，我们主要测试连续性而不是精确的时长匹配
-                is_continuous, length_diff, max_diff = self.test_continuity(output_files, original_audio, sample_rate)
-                
-                # 记录结果
-                result = {
-                    'mode': 'smart',
-                    'duration': duration,
-                    'smart_split': True,
-                    'is_continuous': is_continuous,
-                    'length_diff': length_diff,
-                    'max_amplitude_diff': max_diff
-                }
-                self.test_results.append(result)
-                
-                print(f"  连续性: {'通过' if is_continuous else '失败'}")
-                print(f"  长度差异: {length_diff} 采样点")
-                
-                # 清理输出文件
-                self.cleanup_output_files(output_files)
-            else:
-                print(f"  分割失败: {message}")
+        self.run_cases(self.run_smart_case, test_durations, test_file, original_audio, sample_rate)
     
-    def cleanup_output_files(self, output_files):
-        """清理输出文件"""
-        for file_path in output_files:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        
-        # 删除输出目录（如果为空）
-        output_dir = Path("output")
-        if output_dir.exists() and not any(output_dir.iterdir()):
-            output_dir.rmdir()
+    def run_smart_case(self, duration, test_file, original_audio, sample_rate):
+        """运行一个智能分割用例，返回 (输出行, 结果)"""
+        log = [f"\n测试智能分割: {duration}秒"]
+        
+        # 每个用例输出到单独的临时目录，并行运行时互不影响
+        output_dir = tempfile.mkdtemp(prefix="split_")
+        
+        # 智能分割
+        success, message, output_files = self.splitter.split_audio(
+            test_file, segment_duration=duration, smart_split=True, search_range=1.0, output_dir=output_dir
+        )
+        
+        if not success:
+            log.append(f"  分割失败: {message}")
+            self.cleanup_output_files(output_dir)
+            return log, None
+        
+        # 对于智能分割，我们主要测试连续性而不是精确的时长匹配
+        is_continuous, length_diff, max_diff = self.test_continuity(output_files, original_audio, sample_rate, log)
+        
+        # 记录结果
+        result = {
+            'mode': 'smart',
+            'duration': duration,
+            'smart_split': True,
+            'is_continuous': is_continuous,
+            'length_diff': length_diff,
+            'max_amplitude_diff': max_diff
+        }
+        
+        log.append(f"  连续性: {'通过' if is_continuous else '失败'}")
+        log.append(f"  长度差异: {length_diff} 采样点")
+        
+        # 清理输出文件
+        self.cleanup_output_files(output_dir)
+        
+        return log, result
+    
+    def run_cases(self, run_case, cases, test_file, original_audio, sample_rate):
+        """
+        并行运行一组互不依赖的用例（解码和写文件时libsndfile释放GIL）
+        
+        按用例顺序输出各用例的输出行并记录结果，输出不会交错
+        """
+        with ThreadPoolExecutor(max_workers=min(CASE_WORKERS, len(cases))) as executor:
+            futures = [executor.submit(run_case, case, test_file, original_audio, sample_rate) for case in cases]
+            for future in futures:
+                log, result = future.result()
+                print("\n".join(log))
+                if result is not None:
+                    self.test_results.append(result)
+    
+    def cleanup_output_files(self, output_dir):
+        """清理输出文件：一次删除用例的整个输出目录"""
+        shutil.rmtree(output_dir, ignore_errors=True)
     
     def generate_report(self):
         """生成测试报告"""
@@ -317,7 +386,7 @@ def main():
         # 创建测试音频文件
         test_file, original_audio, sample_rate = tester.create_test_audio_file()
         
-        # 执行各种精确度测试
+        # 执行各种精确度测试（各组依次运行，组内用例并行）
         tester.test_fixed_duration_precision(test_file, original_audio, sample_rate)
         tester.test_custom_duration_precision(test_file, original_audio, sample_rate)
         tester.test_smart_split_precision(test_file, original_audio, sample_rate)
@@ -335,13 +404,6 @@ def main():
     except Exception as e:
         print(f"\n[ERROR] 测试过程中发生错误: {e}")
         return False
-    
-    finally:
-        # 清理测试文件
-        test_file = "precision_test_audio.wav"
-        if os.path.exists(test_file):
-            os.remove(test_file)
-            print(f"\n已清理测试文件: {test_file}")
 
 
 if __name__ == "__main__":
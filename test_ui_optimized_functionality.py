@@ -6,10 +6,11 @@ UI优化后的功能测试脚本
 """
 
 import os
+import shutil
 import sys
+import tempfile
 import numpy as np
 import soundfile as sf
-from pathlib import Path
 import time
 
 # 添加当前目录到Python路径
@@ -17,6 +18,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from main import AudioSplitter
 from video_processor import VideoProcessor
+from create_test_audio import get_cached_wav, spec_hash
 
 
 class ComprehensiveTester:
@@ -28,32 +30,40 @@ class ComprehensiveTester:
         self.test_results = []
         
     def create_test_audio(self, duration=20.0, sample_rate=44100):
-        """创建测试音频文件"""
+        """创建测试音频文件（已存在相同参数的文件时直接复用）"""
         print(f"[INFO] 创建测试音频文件 (时长: {duration}秒, 采样率: {sample_rate}Hz)")
         
-        # 生成复合音频信号（多个频率的正弦波）
-        t = np.linspace(0, duration, int(duration * sample_rate), False)
+        # 测试音频内容由生成代码、时长和采样率决定，保存在共用测试音频目录，之后的测试直接复用
+        test_file = get_cached_wav(f"comprehensive_{duration:g}s_{sample_rate}.wav",
+                                   sample_rate, int(duration * sample_rate),
+                                   lambda path: self.write_test_audio(path, duration, sample_rate),
+                                   spec_hash(ComprehensiveTester.write_test_audio, duration, sample_rate))
+        
+        return test_file, sample_rate
+    
+    def write_test_audio(self, output_file, duration, sample_rate):
+        """生成复合测试音频并保存为16位WAV文件"""
+        # 生成复合音频信号（多个频率的正弦波），时间轴直接用float32的arange生成
+        t = np.arange(int(duration * sample_rate), dtype=np.float32)
+        t *= np.float32(1.0 / sample_rate)
         
         # 基础频率
         freq1 = 440  # A4
         freq2 = 880  # A5
         freq3 = 220  # A3
         
-        # 创建复合信号
-        audio_data = (0.3 * np.sin(2 * np.pi * freq1 * t) + 
-                     0.2 * np.sin(2 * np.pi * freq2 * t) + 
-                     0.1 * np.sin(2 * np.pi * freq3 * t))
+        # 创建复合信号（角频率预先算成float32常量，计算过程保持float32）
+        audio_data = (np.float32(0.3) * np.sin(np.float32(2 * np.pi * freq1) * t) + 
+                     np.float32(0.2) * np.sin(np.float32(2 * np.pi * freq2) * t) + 
+                     np.float32(0.1) * np.sin(np.float32(2 * np.pi * freq3) * t))
         
         # 添加一些静音段来测试智能分割
         silence_start = int(8 * sample_rate)
         silence_end = int(9 * sample_rate)
         audio_data[silence_start:silence_end] *= 0.01  # 几乎静音
         
-        # 保存为WAV文件
-        test_file = "comprehensive_test_audio.wav"
-        sf.write(test_file, audio_data, sample_rate)
-        
-        return test_file, audio_data, sample_rate
+        # 保存为16位WAV文件（临时文件没有.wav扩展名，需要指定格式）
+        sf.write(output_file, audio_data, sample_rate, subtype='PCM_16', format='WAV')
     
     def test_basic_audio_loading(self, test_file):
         """测试基础音频加载功能"""
@@ -68,10 +78,9 @@ class ComprehensiveTester:
             if not is_supported:
                 return False
             
-            # 测试音频加载
-            import librosa
-            audio_data, sample_rate = librosa.load(test_file, sr=None)
-            print(f"音频加载成功: 时长={len(audio_data)/sample_rate:.3f}秒, 采样率={sample_rate}Hz")
+            # 测试音频加载（只需要时长，读取文件头即可，不解码音频数据）
+            info = sf.info(test_file)
+            print(f"音频加载成功: 时长={info.frames/info.samplerate:.3f}秒, 采样率={info.samplerate}Hz")
             
             return True
             
@@ -89,42 +98,45 @@ class ComprehensiveTester:
             duration = 3.5
             print(f"测试固定时长分割: {duration}秒")
             
+            # 输出到单独的临时目录，测试结束后整体删除
+            output_dir = tempfile.mkdtemp(prefix="split_")
             success, message, output_files = self.splitter.split_audio(
-                test_file, segment_duration=duration, smart_split=False
+                test_file, segment_duration=duration, smart_split=False, output_dir=output_dir
             )
             
             if success:
                 print(f"[OK] 分割成功: {message}")
                 print(f"生成文件数量: {len(output_files)}")
                 
-                # 验证精确度
+                # 验证精确度（各片段的输出行先收集起来，最后一次输出）
                 total_error = 0
+                lines = []
                 for i, file_path in enumerate(output_files):
-                    if os.path.exists(file_path):
-                        audio_data, sr = sf.read(file_path)
-                        actual_duration = len(audio_data) / sr
-                        expected_duration = duration if i < len(output_files) - 1 else None
-                        
-                        if expected_duration:
-                            error = abs(actual_duration - expected_duration)
-                            total_error += error
-                            print(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
-                        else:
-                            print(f"  片段 {i+1}: 最后片段={actual_duration:.6f}s")
-                        
-                        # 清理文件
-                        os.remove(file_path)
+                    # 只读取文件头中的帧数，不解码音频数据；文件不存在或无法读取时跳过
+                    try:
+                        info = sf.info(file_path)
+                    except RuntimeError:
+                        continue
+                    actual_duration = info.frames / info.samplerate
+                    expected_duration = duration if i < len(output_files) - 1 else None
+                    
+                    if expected_duration:
+                        error = abs(actual_duration - expected_duration)
+                        total_error += error
+                        lines.append(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
+                    else:
+                        lines.append(f"  片段 {i+1}: 最后片段={actual_duration:.6f}s")
+                print("\n".join(lines))
                 
-                # 清理输出目录
-                output_dir = Path("output")
-                if output_dir.exists() and not any(output_dir.iterdir()):
-                    output_dir.rmdir()
+                # 清理文件：一次删除整个输出目录
+                shutil.rmtree(output_dir, ignore_errors=True)
                 
                 avg_error_ms = (total_error / max(1, len(output_files) - 1)) * 1000
                 print(f"平均误差: {avg_error_ms:.3f}ms")
                 
                 return avg_error_ms <= 1.0
             else:
+                shutil.rmtree(output_dir, ignore_errors=True)
                 print(f"[FAIL] 分割失败: {message}")
                 return False
                 
@@ -142,38 +154,41 @@ class ComprehensiveTester:
             custom_durations = [2.5, 4.0, 3.2, 2.8]
             print(f"测试自定义时长分割: {custom_durations}")
             
+            # 输出到单独的临时目录，测试结束后整体删除
+            output_dir = tempfile.mkdtemp(prefix="split_")
             success, message, output_files = self.splitter.split_audio(
-                test_file, custom_durations=custom_durations, smart_split=False
+                test_file, custom_durations=custom_durations, smart_split=False, output_dir=output_dir
             )
             
             if success:
                 print(f"[OK] 分割成功: {message}")
                 print(f"生成文件数量: {len(output_files)}")
                 
-                # 验证精确度
+                # 验证精确度（各片段的输出行先收集起来，最后一次输出）
                 total_error = 0
-                for i, file_path in enumerate(output_files):
-                    if os.path.exists(file_path) and i < len(custom_durations):
-                        audio_data, sr = sf.read(file_path)
-                        actual_duration = len(audio_data) / sr
-                        expected_duration = custom_durations[i]
-                        error = abs(actual_duration - expected_duration)
-                        total_error += error
-                        print(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
-                        
-                        # 清理文件
-                        os.remove(file_path)
+                lines = []
+                for i, file_path in enumerate(output_files[:len(custom_durations)]):
+                    # 只读取文件头中的帧数，不解码音频数据；文件不存在或无法读取时跳过
+                    try:
+                        info = sf.info(file_path)
+                    except RuntimeError:
+                        continue
+                    actual_duration = info.frames / info.samplerate
+                    expected_duration = custom_durations[i]
+                    error = abs(actual_duration - expected_duration)
+                    total_error += error
+                    lines.append(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
+                print("\n".join(lines))
                 
-                # 清理输出目录
-                output_dir = Path("output")
-                if output_dir.exists() and not any(output_dir.iterdir()):
-                    output_dir.rmdir()
+                # 清理文件：一次删除整个输出目录
+                shutil.rmtree(output_dir, ignore_errors=True)
                 
                 avg_error_ms = (total_error / len(custom_durations)) * 1000
                 print(f"平均误差: {avg_error_ms:.3f}ms")
                 
                 return avg_error_ms <= 1.0
             else:
+                shutil.rmtree(output_dir, ignore_errors=True)
                 print(f"[FAIL] 分割失败: {message}")
                 return False
                 
@@ -192,34 +207,38 @@ class ComprehensiveTester:
             search_range = 1.0
             print(f"测试智能分割: 目标时长={duration}秒, 搜索范围={search_range}秒")
             
+            # 输出到单独的临时目录，测试结束后整体删除
+            output_dir = tempfile.mkdtemp(prefix="split_")
             success, message, output_files = self.splitter.split_audio(
-                test_file, segment_duration=duration, smart_split=True, search_range=search_range
+                test_file, segment_duration=duration, smart_split=True, search_range=search_range, output_dir=output_dir
             )
             
             if success:
                 print(f"[OK] 智能分割成功: {message}")
                 print(f"生成文件数量: {len(output_files)}")
                 
-                # 验证连续性
-                reconstructed_audio = []
+                # 验证连续性（先收集各片段数组，最后一次拼接；输出行也最后一次输出）
+                segments = []
+                lines = []
                 for i, file_path in enumerate(output_files):
-                    if os.path.exists(file_path):
-                        audio_data, sr = sf.read(file_path)
-                        reconstructed_audio.extend(audio_data)
-                        actual_duration = len(audio_data) / sr
-                        print(f"  片段 {i+1}: 时长={actual_duration:.6f}s")
-                        
-                        # 清理文件
-                        os.remove(file_path)
+                    # 文件不存在或无法读取时跳过
+                    try:
+                        audio_data, sr = sf.read(file_path, dtype='float32')
+                    except RuntimeError:
+                        continue
+                    segments.append(audio_data)
+                    actual_duration = len(audio_data) / sr
+                    lines.append(f"  片段 {i+1}: 时长={actual_duration:.6f}s")
+                print("\n".join(lines))
                 
-                # 清理输出目录
-                output_dir = Path("output")
-                if output_dir.exists() and not any(output_dir.iterdir()):
-                    output_dir.rmdir()
+                # 清理文件：一次删除整个输出目录
+                shutil.rmtree(output_dir, ignore_errors=True)
                 
+                reconstructed_audio = np.concatenate(segments) if segments else np.empty(0, dtype=np.float32)
                 print(f"重构音频长度: {len(reconstructed_audio)} 采样点")
                 return True
             else:
+                shutil.rmtree(output_dir, ignore_errors=True)
                 print(f"[FAIL] 智能分割失败: {message}")
                 return False
                 
@@ -237,38 +256,41 @@ class ComprehensiveTester:
             video_durations = [3.123, 4.567, 2.890, 5.234]
             print(f"测试视频时长匹配: {video_durations}")
             
+            # 输出到单独的临时目录，测试结束后整体删除
+            output_dir = tempfile.mkdtemp(prefix="split_")
             success, message, output_files = self.splitter.split_audio_by_video_durations(
-                test_file, video_durations, smart_split=False
+                test_file, video_durations, smart_split=False, output_dir=output_dir
             )
             
             if success:
                 print(f"[OK] 视频时长匹配分割成功: {message}")
                 print(f"生成文件数量: {len(output_files)}")
                 
-                # 验证精确度
+                # 验证精确度（各片段的输出行先收集起来，最后一次输出）
                 total_error = 0
-                for i, file_path in enumerate(output_files):
-                    if os.path.exists(file_path) and i < len(video_durations):
-                        audio_data, sr = sf.read(file_path)
-                        actual_duration = len(audio_data) / sr
-                        expected_duration = video_durations[i]
-                        error = abs(actual_duration - expected_duration)
-                        total_error += error
-                        print(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
-                        
-                        # 清理文件
-                        os.remove(file_path)
+                lines = []
+                for i, file_path in enumerate(output_files[:len(video_durations)]):
+                    # 只读取文件头中的帧数，不解码音频数据；文件不存在或无法读取时跳过
+                    try:
+                        info = sf.info(file_path)
+                    except RuntimeError:
+                        continue
+                    actual_duration = info.frames / info.samplerate
+                    expected_duration = video_durations[i]
+                    error = abs(actual_duration - expected_duration)
+                    total_error += error
+                    lines.append(f"  片段 {i+1}: 期望={expected_duration:.6f}s, 实际={actual_duration:.6f}s, 误差={error*1000:.3f}ms")
+                print("\n".join(lines))
                 
-                # 清理输出目录
-                output_dir = Path("output")
-                if output_dir.exists() and not any(output_dir.iterdir()):
-                    output_dir.rmdir()
+                # 清理文件：一次删除整个输出目录
+                shutil.rmtree(output_dir, ignore_errors=True)
                 
                 avg_error_ms = (total_error / len(video_durations)) * 1000
                 print(f"平均误差: {avg_error_ms:.3f}ms")
                 
                 return avg_error_ms <= 1.0
             else:
+                shutil.rmtree(output_dir, ignore_errors=True)
                 print(f"[FAIL] 视频时长匹配分割失败: {message}")
                 return False
                 
@@ -301,8 +323,8 @@ class ComprehensiveTester:
             
             # 测试时长格式化
             test_durations = [0.0, 30.5, 65.123, 3661.789]
-            for duration in test_durations:
-                formatted = self.video_processor.format_duration(duration)
+            formatted_durations = self.video_processor.format_durations(test_durations)
+            for duration, formatted in zip(test_durations, formatted_durations):
                 print(f"  时长格式化 {duration:.3f}s -> {formatted}")
             
             print(f"视频处理器功能测试: {'通过' if format_test_passed else '失败'}")
@@ -319,32 +341,31 @@ class ComprehensiveTester:
         print("=" * 60)
         
         # 创建测试音频
-        test_file, original_audio, sample_rate = self.create_test_audio()
+        test_file, sample_rate = self.create_test_audio()
+        # 预先解码测试音频，之后各项分割测试都复用分割器缓存的解码结果
+        self.splitter.load_audio_cached(test_file)
         
         # 运行所有测试
+        # 测试表：(测试名称, 测试方法, 参数)
         tests = [
-            ("基础音频加载", lambda: self.test_basic_audio_loading(test_file)),
-            ("固定时长分割", lambda: self.test_fixed_duration_split(test_file)),
-            ("自定义时长分割", lambda: self.test_custom_duration_split(test_file)),
-            ("智能分割", lambda: self.test_smart_split(test_file)),
-            ("视频时长匹配", lambda: self.test_video_duration_matching(test_file)),
-            ("视频处理器", lambda: self.test_video_processor())
+            ("基础音频加载", self.test_basic_audio_loading, (test_file,)),
+            ("固定时长分割", self.test_fixed_duration_split, (test_file,)),
+            ("自定义时长分割", self.test_custom_duration_split, (test_file,)),
+            ("智能分割", self.test_smart_split, (test_file,)),
+            ("视频时长匹配", self.test_video_duration_matching, (test_file,)),
+            ("视频处理器", self.test_video_processor, ())
         ]
         
         results = []
-        for test_name, test_func in tests:
+        for test_name, test_func, args in tests:
             try:
-                result = test_func()
+                result = test_func(*args)
                 results.append((test_name, result))
             except Exception as e:
                 print(f"[ERROR] 测试 {test_name} 发生异常: {e}")
                 results.append((test_name, False))
         
-        # 清理测试文件
-        if os.path.exists(test_file):
-            os.remove(test_file)
-        
-        # 生成测试报告
+        # 生成测试报告（测试音频保留给之后的测试复用）
         self.generate_test_report(results)
         
         return results
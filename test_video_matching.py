@@ -5,16 +5,18 @@
 """
 
 import os
+import shutil
 import sys
+import tempfile
 import numpy as np
 import soundfile as sf
-from pathlib import Path
 
 # 添加当前目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from video_processor import VideoProcessor
 from main import AudioSplitter
+from create_test_audio import get_shared_tone
 
 
 def create_test_video_info():
@@ -34,16 +36,11 @@ def create_test_audio(duration=25.0, sample_rate=44100):
     """创建测试音频文件"""
     print(f"创建测试音频文件 (时长: {duration}秒, 采样率: {sample_rate}Hz)...")
     
-    # 生成测试音频数据（正弦波）
-    t = np.linspace(0, duration, int(duration * sample_rate), False)
-    frequency = 440  # A4音符
-    audio_data = 0.5 * np.sin(2 * np.pi * frequency * t)
+    # 440Hz正弦波16位WAV文件（A4音符），与其他测试脚本共用，已存在时不再重新生成
+    test_file = get_shared_tone(duration, sample_rate)
+    num_samples = int(duration * sample_rate)
     
-    # 保存为WAV文件
-    test_file = "test_audio_for_video_matching.wav"
-    sf.write(test_file, audio_data, sample_rate)
-    
-    return test_file, audio_data, sample_rate
+    return test_file, num_samples, sample_rate
 
 
 def test_video_processor():
@@ -80,9 +77,10 @@ def test_video_duration_matching():
     print("\n测试视频时长匹配分割功能...")
     print("=" * 50)
     
+    output_dir = None
     try:
         # 创建测试音频
-        test_file, original_audio, sample_rate = create_test_audio()
+        test_file, original_length, sample_rate = create_test_audio()
         
         # 创建音频分割器
         splitter = AudioSplitter()
@@ -96,8 +94,10 @@ def test_video_duration_matching():
         
         # 执行视频时长匹配分割
         print("\n执行视频时长匹配分割...")
+        # 输出到临时目录（Linux上通常位于内存文件系统），验证后整体删除
+        output_dir = tempfile.mkdtemp(prefix="audio_split_")
         success, message, output_files = splitter.split_audio_by_video_durations(
-            test_file, video_durations, smart_split=False
+            test_file, video_durations, smart_split=False, output_dir=output_dir
         )
         
         if success:
@@ -106,35 +106,35 @@ def test_video_duration_matching():
             
             # 验证分割精确度
             print("\n验证分割精确度:")
-            total_error = 0
             
-            for i, (file_path, expected_duration) in enumerate(zip(output_files, video_durations)):
-                if os.path.exists(file_path):
-                    # 读取分割后的音频文件
-                    audio_data, sr = sf.read(file_path)
-                    actual_duration = len(audio_data) / sr
-                    error = abs(actual_duration - expected_duration)
-                    total_error += error
-                    
-                    print(f"  片段 {i+1} ({test_videos[i]['name']}): "
-                          f"期望={expected_duration:.6f}s, "
-                          f"实际={actual_duration:.6f}s, "
-                          f"误差={error:.6f}s ({error*1000:.3f}ms)")
-                else:
-                    print(f"  片段 {i+1}: 文件不存在")
+            # 只读取分割后音频文件头中的帧数，不解码音频数据；文件不存在或无法读取时记为NaN
+            expected_durations = np.asarray(video_durations, dtype=np.float64)
+            actual_durations = np.full(len(video_durations), np.nan)
+            for i, file_path in enumerate(output_files[:len(video_durations)]):
+                try:
+                    info = sf.info(file_path)
+                except RuntimeError:
+                    continue
+                actual_durations[i] = info.frames / info.samplerate
             
-            avg_error_ms = (total_error / len(video_durations)) * 1000
-            print(f"\n平均误差: {avg_error_ms:.3f}ms")
+            # 误差对所有片段一次计算
+            errors = np.abs(actual_durations - expected_durations)
             
-            # 清理输出文件
-            for file_path in output_files:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
+            lines = []
+            for i, (expected_duration, actual_duration, error) in enumerate(
+                    zip(expected_durations.tolist(), actual_durations.tolist(), errors.tolist())):
+                if np.isnan(actual_duration):
+                    lines.append(f"  片段 {i+1}: 文件不存在")
+                    continue
+                lines.append(f"  片段 {i+1} ({test_videos[i]['name']}): "
+                             f"期望={expected_duration:.6f}s, "
+                             f"实际={actual_duration:.6f}s, "
+                             f"误差={error:.6f}s ({error*1000:.3f}ms)")
+            print("\n".join(lines))
             
-            # 删除输出目录
-            output_dir = Path("output")
-            if output_dir.exists() and not any(output_dir.iterdir()):
-                output_dir.rmdir()
+            # 不存在的片段不计入误差总和，但仍按全部片段数求平均
+            avg_error_ms = np.nansum(errors) / len(video_durations) * 1000
+            print(f"\n平均误差: {avg_error_ms:.3f}ms")
             
             # 判断精确度
             if avg_error_ms <= 1.0:
@@ -152,10 +152,9 @@ def test_video_duration_matching():
         return False
     
     finally:
-        # 清理测试文件
-        test_file = "test_audio_for_video_matching.wav"
-        if os.path.exists(test_file):
-            os.remove(test_file)
+        # 清理文件：一次删除整个输出目录（共用的测试音频保留供之后复用）
+        if output_dir is not None:
+            shutil.rmtree(output_dir, ignore_errors=True)
 
 
 def test_smart_video_matching():
@@ -163,9 +162,10 @@ def test_smart_video_matching():
     print("\n测试智能视频时长匹配...")
     print("=" * 50)
     
+    output_dir = None
     try:
         # 创建测试音频
-        test_file, original_audio, sample_rate = create_test_audio()
+        test_file, original_length, sample_rate = create_test_audio()
         
         # 创建音频分割器
         splitter = AudioSplitter()
@@ -178,8 +178,10 @@ def test_smart_video_matching():
         
         # 执行智能视频时长匹配分割
         print("\n执行智能视频时长匹配分割...")
+        # 输出到临时目录（Linux上通常位于内存文件系统），验证后整体删除
+        output_dir = tempfile.mkdtemp(prefix="audio_split_")
         success, message, output_files = splitter.split_audio_by_video_durations(
-            test_file, video_durations, smart_split=True, search_range=1.0
+            test_file, video_durations, smart_split=True, search_range=1.0, output_dir=output_dir
         )
         
         if success:
@@ -188,35 +190,37 @@ def test_smart_video_matching():
             
             # 验证文件连续性
             print("\n验证音频连续性:")
-            reconstructed_audio = []
             
+            # 先只读取各片段文件头中的帧数，文件不存在或无法读取时跳过
+            segment_infos = []
             for i, file_path in enumerate(output_files):
-                if os.path.exists(file_path):
-                    audio_data, sr = sf.read(file_path)
-                    reconstructed_audio.extend(audio_data)
-                    actual_duration = len(audio_data) / sr
-                    print(f"  片段 {i+1}: 时长={actual_duration:.6f}s")
+                try:
+                    segment_infos.append((i, file_path, sf.info(file_path)))
+                except RuntimeError:
+                    continue
+            
+            # 按总帧数预先分配重构缓冲区，各片段直接解码到缓冲区中对应的位置
+            total_frames = sum(info.frames for _, _, info in segment_infos)
+            channels = segment_infos[0][2].channels if segment_infos else 1
+            shape = (total_frames,) if channels == 1 else (total_frames, channels)
+            reconstructed_audio = np.empty(shape, dtype=np.float32)
+            
+            offset = 0
+            for i, file_path, info in segment_infos:
+                sf.read(file_path, dtype='float32', out=reconstructed_audio[offset:offset + info.frames])
+                offset += info.frames
+                actual_duration = info.frames / info.samplerate
+                print(f"  片段 {i+1}: 时长={actual_duration:.6f}s")
             
             # 比较原始音频和重构音频
-            reconstructed_audio = np.array(reconstructed_audio)
-            min_length = min(len(original_audio), len(reconstructed_audio))
+            min_length = min(original_length, len(reconstructed_audio))
             
-            length_diff = abs(len(original_audio) - len(reconstructed_audio))
+            length_diff = abs(original_length - len(reconstructed_audio))
             print(f"\n连续性检查:")
-            print(f"  原始音频长度: {len(original_audio)} 采样点")
+            print(f"  原始音频长度: {original_length} 采样点")
             print(f"  重构音频长度: {len(reconstructed_audio)} 采样点")
             print(f"  长度差异: {length_diff} 采样点")
             
-            # 清理输出文件
-            for file_path in output_files:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-            
-            # 删除输出目录
-            output_dir = Path("output")
-            if output_dir.exists() and not any(output_dir.iterdir()):
-                output_dir.rmdir()
-            
             if length_diff <= 1:
                 print("✓ 连续性测试通过")
                 return True
@@ -232,10 +236,9 @@ def test_smart_video_matching():
         return False
     
     finally:
-        # 清理测试文件
-        test_file = "test_audio_for_video_matching.wav"
-        if os.path.exists(test_file):
-            os.remove(test_file)
+        # 清理文件：一次删除整个输出目录（共用的测试音频保留供之后复用）
+        if output_dir is not None:
+            shutil.rmtree(output_dir, ignore_errors=True)
 
 
 def main():
@@ -5,28 +5,280 @@
 用于读取视频文件时长和相关信息
 """
 
+import json
+import mmap
 import os
-import sys
+import shutil
+import struct
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fractions import Fraction
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 
-try:
-    import cv2
-except ImportError as e:
-    print(f"请安装视频处理库:")
-    print(f"pip install opencv-python")
-    print(f"错误详情: {e}")
-    sys.exit(1)
+MP4_SUFFIXES = frozenset(['.mp4', '.mov', '.m4v'])  # 可直接解析文件头获取时长的MP4/QuickTime格式
+FFPROBE_TIMEOUT = 10  # 调用ffprobe读取视频信息的超时时间（秒）
+PROBE_WORKERS = 8  # 批量读取视频时长时并行的线程数
+DURATION_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "audio_splitter",
+                                   "video_durations.json")  # GUI使用的视频时长缓存文件，跨运行复用读取结果
+DURATION_CACHE_SIZE = 4096  # 视频时长缓存的最大条目数，超出时丢弃最早加入的条目
+VIDEO_INFO_CACHE_SIZE = 4096  # 视频流属性缓存的最大条目数
+CV2_MISSING_MESSAGE = "未安装视频处理库，请运行: pip install opencv-python-headless"  # OpenCV不可用时的提示
+
+
+def iter_mp4_boxes(data, start, end):
+    """
+    遍历MP4文件中 [start, end) 范围内的box
+
+    Yields:
+        tuple: (box类型, 内容起点, 内容终点)
+    """
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack_from('>I4s', data, pos)
+        header_size = 8
+        if size == 1:
+            # 64位长度
+            if pos + 16 > end:
+                return
+            size = struct.unpack_from('>Q', data, pos + 8)[0]
+            header_size = 16
+        elif size == 0:
+            # 长度为0表示一直延续到文件末尾
+            size = end - pos
+        if size < header_size or pos + size > end:
+            return
+        yield box_type, pos + header_size, pos + size
+        pos += size
+
+
+def read_mp4_video_duration(file_path):
+    """
+    直接解析MP4/MOV文件头，获取视频轨道的时长
+
+    只读取moov中视频轨道的mdhd（媒体时间刻度和时长），不初始化解码器；
+    mdat等大块数据按box长度直接跳过，通过mmap访问，不会读入内存
+
+    Args:
+        file_path (str): 视频文件路径
+
+    Returns:
+        float: 视频轨道时长（秒），文件头无法解析时返回None
+    """
+    with open(file_path, 'rb') as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件
+            return None
+
+    with data:
+        for box_type, start, end in iter_mp4_boxes(data, 0, len(data)):
+            if box_type == b'moov':
+                return _find_video_track_duration(data, start, end)
+
+    return None
+
+
+def _find_video_track_duration(data, moov_start, moov_end):
+    """在moov中查找第一个视频轨道（hdlr类型为vide），返回其mdhd记录的时长（秒）"""
+    for box_type, trak_start, trak_end in iter_mp4_boxes(data, moov_start, moov_end):
+        if box_type != b'trak':
+            continue
+        for box_type, mdia_start, mdia_end in iter_mp4_boxes(data, trak_start, trak_end):
+            if box_type != b'mdia':
+                continue
+
+            handler_type = None
+            timescale = duration = None
+            for box_type, start, end in iter_mp4_boxes(data, mdia_start, mdia_end):
+                if box_type == b'hdlr' and end - start >= 12:
+                    handler_type = data[start + 8:start + 12]
+                elif box_type == b'mdhd' and end - start >= 20:
+                    # 版本1使用64位的创建/修改时间和时长
+                    if data[start] == 1 and end - start >= 32:
+                        timescale, duration = struct.unpack_from('>IQ', data, start + 20)
+                    else:
+                        timescale, duration = struct.unpack_from('>II', data, start + 12)
+                        if duration == 0xFFFFFFFF:
+                            # 时长未知
+                            duration = None
+
+            if handler_type == b'vide' and timescale and duration:
+                return duration / timescale
+
+    return None
+
+
+@lru_cache(maxsize=None)
+def get_cv2():
+    """
+    获取OpenCV模块（首次调用时才导入）
+
+    只用到格式检查、时长格式化等功能时不需要加载OpenCV；
+    MP4文件头和ffprobe都无法获取时长时才会用到
+
+    Returns:
+        module: cv2模块，未安装时返回None
+    """
+    try:
+        import cv2
+        return cv2
+    except ImportError:
+        return None
+
+
+@lru_cache(maxsize=VIDEO_INFO_CACHE_SIZE)
+def read_video_stream_info(real_path, mtime_ns, size):
+    """
+    用OpenCV读取视频流属性
+
+    按 (真实路径, 修改时间ns, 文件大小) 缓存，后两个参数只作为缓存键：
+    文件被修改后键随之改变，缓存自动失效
+
+    Returns:
+        tuple: (fps, frame_count, width, height)，无法打开视频时返回None
+    """
+    cv2 = get_cv2()
+    cap = cv2.VideoCapture(real_path)
+    if not cap.isOpened():
+        return None
+
+    try:
+        return (cap.get(cv2.CAP_PROP_FPS), cap.get(cv2.CAP_PROP_FRAME_COUNT),
+                int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    finally:
+        cap.release()
+
+
+@lru_cache(maxsize=None)
+def get_ffprobe_path():
+    """查找ffprobe可执行文件（只查找一次），未安装时返回None"""
+    return shutil.which('ffprobe')
+
+
+def read_ffprobe_video_duration(file_path):
+    """
+    用ffprobe读取视频流的帧数和帧率计算时长（与OpenCV的计算方式一致），只解析容器头
+
+    Args:
+        file_path (str): 视频文件路径
+
+    Returns:
+        float: 视频时长（秒），ffprobe不可用或无法获取时返回None
+    """
+    ffprobe = get_ffprobe_path()
+    if ffprobe is None:
+        return None
+
+    try:
+        completed = subprocess.run(
+            [ffprobe, "-v", "error", "-select_streams", "v:0",
+             "-show_entries", "stream=duration,nb_frames,r_frame_rate", "-of", "json", file_path],
+            capture_output=True, timeout=FFPROBE_TIMEOUT
+        )
+        streams = json.loads(completed.stdout or b'{}').get("streams") or []
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return None
+
+    if not streams:
+        return None
+    stream = streams[0]
+
+    try:
+        # 优先使用帧数/帧率，与OpenCV按帧计算的时长一致
+        frame_rate = Fraction(stream["r_frame_rate"])
+        frame_count = int(stream["nb_frames"])
+        if frame_rate > 0 and frame_count > 0:
+            return float(frame_count / frame_rate)
+    except (KeyError, ValueError, ZeroDivisionError):
+        pass
+
+    try:
+        duration = float(stream["duration"])
+    except (KeyError, ValueError):
+        return None
+    return duration if duration > 0 else None
 
 
 class VideoProcessor:
     """视频处理类"""
     
-    def __init__(self):
+    def __init__(self, cache_file=None):
+        """
+        Args:
+            cache_file (str, optional): 视频时长缓存文件路径（如DURATION_CACHE_FILE），
+                默认为None，只在内存中缓存，不读写磁盘
+        """
         self.supported_formats = ['.mp4', '.avi', '.mov', '.mkv', '.wmv', '.flv', '.webm', '.m4v']
+        self._supported_suffixes = frozenset(self.supported_formats)  # 用于格式检查的集合，查找为O(1)
+        # 时长缓存：(真实路径, 修改时间ns, 文件大小) -> 时长（秒），文件修改后自动失效；
+        # 最多保留DURATION_CACHE_SIZE条，批量读取时多个线程同时写入，写入时加锁
+        self._cache_file = cache_file
+        self._cache_lock = threading.Lock()
+        self._cache_dirty = False
+        self._duration_cache = self._load_duration_cache()
+    
+    def _load_duration_cache(self):
+        """
+        从缓存文件读取之前的时长结果，文件不存在或损坏时返回空缓存
+
+        只保留最近的DURATION_CACHE_SIZE条，并在读取时（每个实例只读取一次）丢弃
+        视频文件已被删除或修改过的条目，保存时不再逐个检查
+        """
+        if self._cache_file is None:
+            return {}
+        try:
+            with open(self._cache_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            cache = {(path, int(mtime_ns), int(size)): float(duration)
+                     for path, mtime_ns, size, duration in entries[-DURATION_CACHE_SIZE:]}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+        valid_cache = {}
+        for (path, mtime_ns, size), duration in cache.items():
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if (st.st_mtime_ns, st.st_size) == (mtime_ns, size):
+                valid_cache[(path, mtime_ns, size)] = duration
+        # 有条目被丢弃时，下次保存写回清理后的缓存
+        self._cache_dirty = len(valid_cache) < len(entries)
+        return valid_cache
+    
+    def _store_duration(self, cache_key, duration):
+        """记录一个时长结果，超出条目上限时丢弃最早加入的条目"""
+        with self._cache_lock:
+            self._duration_cache[cache_key] = duration
+            while len(self._duration_cache) > DURATION_CACHE_SIZE:
+                del self._duration_cache[next(iter(self._duration_cache))]
+            self._cache_dirty = True
+    
+    def save_duration_cache(self):
+        """把时长缓存写回缓存文件（有新结果或读取时清理过条目时才写），写入失败时忽略"""
+        if self._cache_file is None or not self._cache_dirty:
+            return
+        with self._cache_lock:
+            entries = [[path, mtime_ns, size, duration]
+                       for (path, mtime_ns, size), duration in self._duration_cache.items()]
+        temp_file = f"{self._cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self._cache_file), exist_ok=True)
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, ensure_ascii=False)
+            # 先写临时文件再替换，避免中断时留下不完整的缓存文件
+            os.replace(temp_file, self._cache_file)
+            self._cache_dirty = False
+        except OSError:
+            pass
     
     def is_supported_format(self, file_path):
         """检查视频文件格式是否支持"""
-        return Path(file_path).suffix.lower() in self.supported_formats
+        return os.path.splitext(file_path)[1].lower() in self._supported_suffixes
     
     def get_video_duration(self, file_path):
         """
@@ -45,7 +297,51 @@ class VideoProcessor:
             if not self.is_supported_format(file_path):
                 return False, 0.0, f"不支持的视频格式: {Path(file_path).suffix}"
             
+            return self._probe_duration(file_path)
+            
+        except Exception as e:
+            return False, 0.0, f"读取视频时长时发生错误: {str(e)}"
+    
+    def _probe_duration(self, file_path):
+        """
+        读取视频时长，依次尝试：MP4/MOV文件头解析、ffprobe、OpenCV
+
+        前两种方式只读取容器头，不初始化解码器；都无法获取时才用OpenCV打开视频。
+        成功的结果按 (真实路径, 修改时间, 文件大小) 缓存，同一文件未修改时不再重复读取
+
+        Returns:
+            tuple: (success, duration_seconds, error_message)
+        """
+        try:
+            st = os.stat(file_path)
+            cache_key = (os.path.realpath(file_path), st.st_mtime_ns, st.st_size)
+            duration = self._duration_cache.get(cache_key)
+            if duration is not None:
+                return True, duration, ""
+            
+            success, duration, error = self._read_duration(file_path)
+            if success:
+                self._store_duration(cache_key, duration)
+            return success, duration, error
+            
+        except Exception as e:
+            return False, 0.0, f"读取视频时长时发生错误: {str(e)}"
+    
+    def _read_duration(self, file_path):
+        """实际读取视频时长（不经过缓存），返回 (success, duration_seconds, error_message)"""
+        try:
+            duration = None
+            if os.path.splitext(file_path)[1].lower() in MP4_SUFFIXES:
+                duration = read_mp4_video_duration(file_path)
+            if duration is None:
+                duration = read_ffprobe_video_duration(file_path)
+            if duration is not None:
+                return True, duration, ""
+            
             # 使用OpenCV读取视频信息
+            cv2 = get_cv2()
+            if cv2 is None:
+                return False, 0.0, CV2_MISSING_MESSAGE
             cap = cv2.VideoCapture(file_path)
             
             if not cap.isOpened():
@@ -79,30 +375,28 @@ class VideoProcessor:
             dict: 视频信息字典
         """
         try:
-            if not os.path.exists(file_path):
+            try:
+                st = os.stat(file_path)
+            except FileNotFoundError:
                 return {"error": f"文件不存在: {file_path}"}
             
             if not self.is_supported_format(file_path):
                 return {"error": f"不支持的视频格式: {Path(file_path).suffix}"}
             
-            cap = cv2.VideoCapture(file_path)
+            if get_cv2() is None:
+                return {"error": CV2_MISSING_MESSAGE}
             
-            if not cap.isOpened():
+            # 获取视频属性（同一文件未修改时直接使用缓存的结果）
+            stream_info = read_video_stream_info(os.path.realpath(file_path), st.st_mtime_ns, st.st_size)
+            if stream_info is None:
                 return {"error": f"无法打开视频文件: {file_path}"}
             
-            # 获取视频属性
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            
-            cap.release()
-            
+            fps, frame_count, width, height = stream_info
             if fps <= 0:
                 return {"error": f"无法获取视频帧率: {file_path}"}
             
             duration = frame_count / fps
-            file_size = os.path.getsize(file_path)
+            file_size = st.st_size
             
             return {
                 "file_path": file_path,
@@ -119,6 +413,26 @@ class VideoProcessor:
         except Exception as e:
             return {"error": f"读取视频信息时发生错误: {str(e)}"}
     
+    def get_video_duration_result(self, file_path):
+        """
+        获取单个视频文件的时长，结果格式与batch_get_video_durations的元素相同
+
+        Args:
+            file_path (str): 视频文件路径
+
+        Returns:
+            dict: {file_path, file_name, duration, success, error}
+        """
+        success, duration, error = self.get_video_duration(file_path)
+
+        return {
+            "file_path": file_path,
+            "file_name": os.path.basename(file_path),
+            "duration": duration if success else 0.0,
+            "success": success,
+            "error": error if not success else ""
+        }
+
     def batch_get_video_durations(self, file_paths, progress_callback=None):
         """
         批量获取多个视频文件的时长
@@ -130,27 +444,30 @@ class VideoProcessor:
         Returns:
             list: 视频信息列表，每个元素包含 {file_path, duration, error}
         """
-        results = []
         total_files = len(file_paths)
+        if total_files == 0:
+            return []
         
-        for i, file_path in enumerate(file_paths):
-            success, duration, error = self.get_video_duration(file_path)
+        # 各文件的读取互不依赖（主要是文件头I/O，等待时释放GIL），用线程池并行读取
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, total_files)) as executor:
+            futures = [executor.submit(self.get_video_duration_result, file_path) for file_path in file_paths]
             
-            result = {
-                "file_path": file_path,
-                "file_name": os.path.basename(file_path),
-                "duration": duration if success else 0.0,
-                "success": success,
-                "error": error if not success else ""
-            }
-            
-            results.append(result)
-            
-            # 更新进度
+            # 更新进度：按完成顺序计数（在调用线程中执行，无需加锁）；
+            # 整数百分比每变化约1%才回调一次，文件很多时不会频繁刷新界面
             if progress_callback:
-                progress = int((i + 1) / total_files * 100)
-                progress_callback(progress, f"正在读取视频 {i+1}/{total_files}: {os.path.basename(file_path)}")
+                report_every = max(1, total_files // 100)
+                for done, future in enumerate(as_completed(futures), 1):
+                    if done % report_every and done != total_files:
+                        continue
+                    progress = done * 100 // total_files
+                    file_name = os.path.basename(future.result()['file_path'])
+                    progress_callback(progress, f"正在读取视频 {done}/{total_files}: {file_name}")
+            
+            # 结果按提交顺序收集，保持与输入顺序一致
+            results = [future.result() for future in futures]
         
+        # 保存新读取的时长，下次运行时直接复用
+        self.save_duration_cache()
         return results
     
     def validate_video_files(self, file_paths):
@@ -178,24 +495,13 @@ class VideoProcessor:
                 error_messages.append(f"不支持的格式: {os.path.basename(file_path)}")
                 continue
             
-            # 尝试打开文件验证
-            try:
-                cap = cv2.VideoCapture(file_path)
-                if cap.isOpened():
-                    fps = cap.get(cv2.CAP_PROP_FPS)
-                    cap.release()
-                    
-                    if fps > 0:
-                        valid_files.append(file_path)
-                    else:
-                        invalid_files.append(file_path)
-                        error_messages.append(f"无效的视频文件: {os.path.basename(file_path)}")
-                else:
-                    invalid_files.append(file_path)
-                    error_messages.append(f"无法打开视频文件: {os.path.basename(file_path)}")
-            except Exception as e:
+            # 尝试读取时长验证（与读取时长使用相同的方式，优先只解析容器头）
+            success, _, _ = self._probe_duration(file_path)
+            if success:
+                valid_files.append(file_path)
+            else:
                 invalid_files.append(file_path)
-                error_messages.append(f"验证失败: {os.path.basename(file_path)} - {str(e)}")
+                error_messages.append(f"无效的视频文件: {os.path.basename(file_path)}")
         
         return valid_files, invalid_files, error_messages
     
@@ -209,17 +515,26 @@ class VideoProcessor:
         Returns:
             str: 格式化的时长字符串
         """
-        if duration_seconds < 0:
-            return "00:00.000"
+        return self.format_durations([duration_seconds])[0]
+    
+    def format_durations(self, durations):
+        """
+        批量格式化时长显示，时、分、秒的拆分对整个数组一次完成
+        
+        Args:
+            durations (array-like): 时长数组（秒）
+            
+        Returns:
+            list: 格式化的时长字符串列表，负数时长显示为 00:00.000
+        """
+        durations = np.maximum(np.asarray(durations, dtype=np.float64), 0.0)
         
-        hours = int(duration_seconds // 3600)
-        minutes = int((duration_seconds % 3600) // 60)
-        seconds = duration_seconds % 60
+        hours = (durations // 3600).astype(np.int64)
+        minutes = ((durations % 3600) // 60).astype(np.int64)
+        seconds = durations % 60
         
-        if hours > 0:
-            return f"{hours:02d}:{minutes:02d}:{seconds:06.3f}"
-        else:
-            return f"{minutes:02d}:{seconds:06.3f}"
+        return [f"{h:02d}:{m:02d}:{s:06.3f}" if h > 0 else f"{m:02d}:{s:06.3f}"
+                for h, m, s in zip(hours.tolist(), minutes.tolist(), seconds.tolist())]
     
     def get_supported_formats_string(self):
         """获取支持的视频格式字符串"""